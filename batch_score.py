@@ -0,0 +1,172 @@
+"""Score a CSV or JSONL corpus offline with the TF-IDF + Logistic Regression model.
+
+Rows are read and scored in fixed-size chunks so memory use does not grow
+with the size of the input, e.g.:
+
+    python batch_score.py archive/Fake.csv -o fake_scores.jsonl --workers 4
+    python batch_score.py requests.jsonl --format jsonl
+"""
+import argparse
+import collections
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from ml_inference import load_scorer
+
+TEXT_FIELDS = ("text", "content", "body")
+ID_FIELDS = ("id", "request_id")
+
+# Scorer loaded once per worker process
+_scorer = None
+
+
+def _init_worker(model_dir: str, scorer_kind: str = None) -> None:
+    global _scorer
+    _scorer = load_scorer(model_dir, scorer_kind)
+
+
+def read_records(path: str, fmt: str):
+    """Yield records from a CSV or JSONL file one at a time."""
+    if fmt == "csv":
+        # News articles can be far longer than the default 128 KB field limit
+        csv.field_size_limit(sys.maxsize)
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _record_text(record: dict, text_column: str = None, include_title: bool = False) -> str:
+    if text_column:
+        text = record.get(text_column) or ""
+    else:
+        text = next((record[f] for f in TEXT_FIELDS if record.get(f)), "")
+    if include_title and record.get("title"):
+        text = f"{record['title']}\n{text}"
+    return text if isinstance(text, str) else str(text)
+
+
+def _record_id(record: dict, row: int, id_column: str = None):
+    if id_column:
+        return record.get(id_column, row)
+    return next((record[f] for f in ID_FIELDS if f in record), row)
+
+
+def score_chunk(chunk, min_length: int = 50):
+    """Score a list of (id, text) pairs; runs in the parent or a worker process."""
+    valid = [i for i, (_, text) in enumerate(chunk) if len(text.strip()) >= min_length]
+    scores = {}
+    if valid:
+        scores = dict(zip(valid, _scorer.score([chunk[i][1] for i in valid])))
+
+    rows = []
+    for i, (record_id, _) in enumerate(chunk):
+        if i in scores:
+            rows.append({"id": record_id, **scores[i]})
+        else:
+            rows.append({"id": record_id, "error": "Text is too short"})
+    return rows
+
+
+def iter_chunks(records, chunk_size: int, args):
+    """Group records into chunks of (id, text) pairs."""
+    rows = (
+        (_record_id(record, i, args.id_column),
+         _record_text(record, args.text_column, args.include_title))
+        for i, record in enumerate(records)
+    )
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_chunks(chunks, workers: int, model_dir: str, min_length: int, scorer_kind: str = None):
+    """Yield scored chunks in input order, optionally across a process pool."""
+    if workers <= 1:
+        _init_worker(model_dir, scorer_kind)
+        for chunk in chunks:
+            yield score_chunk(chunk, min_length)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_dir, scorer_kind)) as pool:
+        # Bound the number of chunks in flight so the reader cannot run ahead
+        in_flight = collections.deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(score_chunk, chunk, min_length))
+            if len(in_flight) >= workers * 2:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+class ResultWriter:
+    """Write scored rows incrementally as JSONL or CSV."""
+
+    FIELDS = ["id", "prediction", "confidence", "error"]
+
+    def __init__(self, f, fmt: str):
+        self.f = f
+        self.csv_writer = None
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, rows) -> None:
+        if self.csv_writer:
+            self.csv_writer.writerows(rows)
+        else:
+            self.f.write("".join(json.dumps(row) + "\n" for row in rows))
+        self.f.flush()
+
+
+def _detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV/JSONL corpus with the fake news model.")
+    parser.add_argument("input", help="CSV or JSONL file to score")
+    parser.add_argument("-o", "--output", help="Output file (.jsonl or .csv); defaults to stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser.add_argument("--text-column", help="Field holding the article text (default: text/content/body)")
+    parser.add_argument("--id-column", help="Field holding the record id (default: id/request_id/row number)")
+    parser.add_argument("--include-title", action="store_true", help="Prepend the title field to the text")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows vectorized per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 = score in-process)")
+    parser.add_argument("--min-length", type=int, default=50, help="Minimum text length to score")
+    parser.add_argument("--model-dir", default="Model", help="Directory containing the joblib models")
+    parser.add_argument("--scorer", choices=["numpy", "sklearn"], help="Scoring backend (default: ML_SCORER or numpy)")
+    args = parser.parse_args()
+
+    in_format = args.format or _detect_format(args.input)
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    writer = ResultWriter(out, _detect_format(args.output) if args.output else "jsonl")
+
+    start = time.perf_counter()
+    total = 0
+    try:
+        chunks = iter_chunks(read_records(args.input, in_format), args.chunk_size, args)
+        for rows in score_chunks(chunks, args.workers, args.model_dir, args.min_length, args.scorer):
+            writer.write(rows)
+            total += len(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {total} rows in {elapsed:.2f}s ({rate:.0f} rows/second)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
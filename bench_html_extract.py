@@ -0,0 +1,89 @@
+"""Compare the lxml streaming extractor with the BeautifulSoup baseline.
+
+Uses synthetic news pages of 1-5 MB by default, or real pages passed on the
+command line:
+
+    python bench_html_extract.py
+    python bench_html_extract.py saved_article.html --repeat 10
+"""
+import argparse
+import random
+import statistics
+import time
+
+from html_extract import extract_paragraph_text_bs4, extract_paragraph_text_lxml
+
+WORDS = (
+    "government officials said the report was released on tuesday after "
+    "weeks of negotiations between senators and the white house over the "
+    "budget proposal reuters reported citing sources familiar with matter"
+).split()
+
+
+def make_news_page(target_bytes: int, seed: int = 42) -> str:
+    """Build a news-like page with navigation, scripts, ads and paragraphs."""
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><title>Breaking news</title>",
+        "<style>body{font-family:sans-serif}.ad{display:none}</style>",
+        "<script>window.dataLayer=[];function track(e){dataLayer.push(e)}</script>",
+        "</head><body><nav><ul>",
+        "".join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(40)),
+        "</ul></nav><article>"
+    ]
+    size = sum(len(p) for p in parts)
+    while size < target_bytes:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 90)))
+        block = (
+            f"<div class='ad'><script>track({{slot:{rng.randint(0, 999)}}})</script></div>"
+            f"<p>{words} <a href='/story/{rng.randint(0, 10**6)}'>related</a> "
+            f"<strong>{rng.choice(WORDS)}</strong>.</p>"
+        )
+        parts.append(block)
+        size += len(block)
+    parts.append("</article><footer><p>Copyright</p></footer></body></html>")
+    return "".join(parts)
+
+
+def time_extractor(extract, page_html: str, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(page_html)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML paragraph extraction.")
+    parser.add_argument("files", nargs="*", help="HTML files to benchmark (default: synthetic pages)")
+    parser.add_argument("--sizes", default="1,2,5", help="Synthetic page sizes in MB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((path, f.read()))
+    else:
+        pages = [
+            (f"synthetic {mb} MB", make_news_page(int(float(mb) * 1024 * 1024)))
+            for mb in args.sizes.split(",")
+        ]
+
+    print(f"{'page':<20} {'size':>8} {'bs4 ms':>10} {'lxml ms':>10} {'speedup':>8} {'same text':>10}")
+    for name, page_html in pages:
+        bs4_times = time_extractor(extract_paragraph_text_bs4, page_html, args.repeat)
+        lxml_times = time_extractor(extract_paragraph_text_lxml, page_html, args.repeat)
+        same = extract_paragraph_text_bs4(page_html) == extract_paragraph_text_lxml(page_html)
+        bs4_ms = statistics.median(bs4_times) * 1000
+        lxml_ms = statistics.median(lxml_times) * 1000
+        print(
+            f"{name:<20} {len(page_html) / 1024 / 1024:>6.1f}MB {bs4_ms:>10.1f} "
+            f"{lxml_ms:>10.1f} {bs4_ms / lxml_ms:>7.1f}x {str(same):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
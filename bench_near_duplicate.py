@@ -0,0 +1,120 @@
+"""Benchmark near-duplicate lookups as the index grows.
+
+Synthetic articles are indexed first, then the index is filled to each size
+with random signatures (which behave like unrelated articles). Edited
+copies of the indexed articles are then looked up:
+
+    python bench_near_duplicate.py
+    python bench_near_duplicate.py --sizes 100000,1000000,3000000 --articles 2000
+
+Recall is the share of edited copies matched to their original; false
+matches counts fresh, unrelated articles that matched anything.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from near_duplicate import NearDuplicateIndex, signature
+from verdict_cache import content_key
+
+
+def make_vocabulary(rng: random.Random, size: int = 5000) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(size)]
+
+
+def make_article(rng: random.Random, words: list) -> str:
+    sentences = []
+    for _ in range(rng.randint(8, 20)):
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 25)))
+        sentences.append(sentence.capitalize() + ".")
+    return " ".join(sentences)
+
+
+def edit_byline(rng: random.Random, text: str) -> str:
+    return f"By Staff Writer {rng.randint(1, 999)} | " + text + " Share this article on social media."
+
+
+def edit_ocr_noise(rng: random.Random, text: str, rate: float = 0.02) -> str:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return "".join(rng.choice(letters) if rng.random() < rate else c for c in text)
+
+
+def edit_truncate(rng: random.Random, text: str) -> str:
+    return text[:int(len(text) * 0.85)]
+
+
+EDITS = {"byline": edit_byline, "ocr_noise": edit_ocr_noise, "truncated": edit_truncate}
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the near-duplicate index.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Index sizes to test")
+    parser.add_argument("--articles", type=int, default=1000, help="Indexed articles that get looked up")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = make_vocabulary(rng)
+    articles = [make_article(rng, words) for _ in range(args.articles)]
+    unrelated = [make_article(rng, words) for _ in range(args.articles)]
+    queries = {name: [edit(rng, text) for text in articles] for name, edit in EDITS.items()}
+
+    start = time.perf_counter()
+    signatures = np.stack([signature(text) for text in articles])
+    signature_ms = (time.perf_counter() - start) * 1000 / len(articles)
+    keys = [content_key(text) for text in articles]
+    query_signatures = {name: [signature(text) for text in texts] for name, texts in queries.items()}
+    unrelated_signatures = [signature(text) for text in unrelated]
+    print(f"Signature: {signature_ms:.2f} ms per article "
+          f"(mean {statistics.mean(len(t) for t in articles):.0f} characters)")
+
+    np_rng = np.random.default_rng(args.seed)
+    print(f"{'entries':>10} {'memory MB':>10} {'fill s':>8} {'p50 us':>8} {'p95 us':>8} "
+          + " ".join(f"{name + ' recall':>17}" for name in EDITS) + f" {'false matches':>14}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        index = NearDuplicateIndex(max_entries=size, threshold=args.threshold)
+        start = time.perf_counter()
+        for key, sig in zip(keys, signatures):
+            index.add(key, sig)
+        remaining = size - len(keys)
+        while remaining > 0:
+            batch = min(remaining, 100000)
+            index.add_many(
+                np_rng.integers(0, 256, size=(batch, 32), dtype=np.uint8),
+                np_rng.integers(0, 2**16, size=(batch, index.num_perm), dtype=np.uint16)
+            )
+            remaining -= batch
+        fill_seconds = time.perf_counter() - start
+
+        timings = []
+        recall = {}
+        for name, sigs in query_signatures.items():
+            found = 0
+            for key, sig in zip(keys, sigs):
+                start = time.perf_counter()
+                match = index.query(sig)
+                timings.append(time.perf_counter() - start)
+                found += match is not None and match[0] == key
+            recall[name] = found / len(keys)
+        false_matches = sum(index.query(sig) is not None for sig in unrelated_signatures)
+
+        print(
+            f"{len(index):>10} {index.stats()['memory_bytes'] / 1024 / 1024:>10.1f} {fill_seconds:>8.1f} "
+            f"{percentile(timings, 0.5) * 1e6:>8.1f} {percentile(timings, 0.95) * 1e6:>8.1f} "
+            + " ".join(f"{recall[name]:>17.3f}" for name in EDITS)
+            + f" {false_matches:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Local stand-ins for Gemini, OCR.space, Google News and article pages.
+
+Used by bench_suite.py so endpoint benchmarks measure this code rather than
+third-party latency and quotas. Each route sleeps for a configurable time to
+model the upstream. app.py is pointed at the stubs with:
+
+    GEMINI_API_ENDPOINT=http://127.0.0.1:PORT
+    OCR_SPACE_URL=http://127.0.0.1:PORT/parse/image
+    NEWS_SEARCH_URL=http://127.0.0.1:PORT/rss/search
+
+Run standalone for manual testing with ``python bench_stubs.py --port 9100``.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+# Default simulated upstream latency per route, in milliseconds
+DEFAULT_LATENCY_MS = {"gemini": 500, "ocr": 300, "news": 100, "page": 50}
+
+ARTICLE_TEXT = (
+    "The Senate passed the budget bill on Tuesday after weeks of negotiations "
+    "between lawmakers and the White House, officials said. The measure funds "
+    "the government through the end of the fiscal year and includes new money "
+    "for infrastructure, according to a statement released by the committee. "
+)
+
+REPORT_TEXT = """1. VERDICT: REAL
+2. CONFIDENCE: 85%
+3. KEY CLAIMS:
+   - The Senate passed the budget bill
+4. CROSS-REFERENCES:
+   - Source 1: https://example.com/a - Confirms the vote
+5. RED FLAGS (if any):
+   - None
+6. TIMELINESS:
+   - Is this current? Yes"""
+
+
+def article_page(paragraphs: int = 40) -> bytes:
+    body = "".join(f"<p>{ARTICLE_TEXT}</p>" for _ in range(paragraphs))
+    return (
+        "<!DOCTYPE html><html><head><title>Budget bill passes</title></head><body>"
+        f"<nav><a href='/'>Home</a></nav><article>{body}</article></body></html>"
+    ).encode("utf-8")
+
+
+def rss_feed(query: str, items: int = 5) -> bytes:
+    entries = "".join(
+        f"<item><title>{escape(query[:60])} - report {i}</title>"
+        f"<link>https://news.example.com/{i}</link></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Search</title>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+class StubServer:
+    """Threaded HTTP server answering the upstream routes with fixed payloads."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: dict = None):
+        self.latency_ms = {**DEFAULT_LATENCY_MS, **(latency_ms or {})}
+        self.requests = {name: 0 for name in DEFAULT_LATENCY_MS}
+        self._lock = threading.Lock()
+        self._page = article_page()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Environment variables pointing app.py at this server."""
+        return {
+            "GEMINI_API_ENDPOINT": self.url,
+            "OCR_SPACE_URL": f"{self.url}/parse/image",
+            "NEWS_SEARCH_URL": f"{self.url}/rss/search"
+        }
+
+    def _record(self, route: str, sleep: bool = True) -> None:
+        with self._lock:
+            self.requests[route] += 1
+        if sleep:
+            time.sleep(self.latency_ms[route] / 1000)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, body: bytes, content_type: str, status: int = 200):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = urlsplit(self.path)
+                if path.path == "/rss/search":
+                    stub._record("news")
+                    query = parse_qs(path.query).get("q", [""])[0]
+                    self._reply(rss_feed(query), "application/rss+xml")
+                elif path.path.startswith("/article/"):
+                    stub._record("page")
+                    self._reply(stub._page, "text/html; charset=utf-8")
+                else:
+                    self._reply(b"not found", "text/plain", 404)
+
+            def _stream_report(self):
+                # A JSON array of responses, one report line each, spread over the latency
+                stub._record("gemini", sleep=False)
+                lines = REPORT_TEXT.splitlines(keepends=True)
+                delay = stub.latency_ms["gemini"] / 1000 / len(lines)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, line in enumerate(lines):
+                    time.sleep(delay)
+                    body = json.dumps({"candidates": [{
+                        "content": {"parts": [{"text": line}], "role": "model"}, "index": 0
+                    }]})
+                    part = ("[" if i == 0 else ",") + body + ("]" if i == len(lines) - 1 else "")
+                    data = part.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                path = urlsplit(self.path).path
+                if path.endswith(":streamGenerateContent"):
+                    self._stream_report()
+                    return
+                if path == "/parse/image":
+                    stub._record("ocr")
+                    body = {"OCRExitCode": 1, "ParsedResults": [{"ParsedText": ARTICLE_TEXT * 3}]}
+                elif path.endswith(":generateContent"):
+                    stub._record("gemini")
+                    body = {"candidates": [{
+                        "content": {"parts": [{"text": REPORT_TEXT}], "role": "model"},
+                        "finishReason": "STOP",
+                        "index": 0
+                    }]}
+                else:
+                    self._reply(b"not found", "text/plain", 404)
+                    return
+                self._reply(json.dumps(body).encode("utf-8"), "application/json")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def parse_latency(value: str) -> dict:
+    """Parse "gemini=800,ocr=300" into a latency mapping."""
+    latency = {}
+    for item in filter(None, value.split(",")):
+        name, ms = item.split("=")
+        if name not in DEFAULT_LATENCY_MS:
+            raise ValueError(f"Unknown stub route: {name}")
+        latency[name] = float(ms)
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve stub upstreams for local benchmarking.")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", default="", help="Per-route latency, e.g. gemini=800,ocr=300")
+    args = parser.parse_args()
+
+    server = StubServer(port=args.port, latency_ms=parse_latency(args.latency))
+    for name, value in server.env().items():
+        print(f"{name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""Benchmark suite for the classifier, text extraction and the API endpoints.
+
+Results are written as a single JSON document (with the git commit and a
+hash of the model files) so runs can be compared between code and model
+versions:
+
+    python bench_suite.py -o bench.json
+    python bench_suite.py --only model,extraction --fixtures fixtures/
+
+Sections:
+
+    model        single-article latency per article-length bucket and batched
+                 throughput, for the NumPy and sklearn scorers
+    extraction   HTML, PDF and image (OCR preprocessing, plus tesseract when
+                 installed) on synthetic fixtures and any files in --fixtures
+    endpoints    /api/predict and /api/verify end to end: ml_app.py and app.py
+                 run under uvicorn with Gemini, OCR.space and Google News
+                 replaced by bench_stubs.StubServer. Upstream rate limits,
+                 call coalescing, near-duplicate reuse and the news search
+                 cache are off unless --upstream-limits is given; the app
+                 settings used are recorded under "app_env"
+"""
+import argparse
+import asyncio
+import datetime
+import glob
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_html_extract import make_news_page
+from bench_stubs import StubServer, parse_latency
+
+SECTIONS = ("model", "extraction", "endpoints")
+LENGTH_BUCKETS = (50, 200, 800, 3000)
+BATCH_SIZES = (1, 8, 32, 256)
+# app.py settings for the endpoint benchmark unless --upstream-limits is given
+UNLIMITED_UPSTREAM_ENV = {
+    "GEMINI_RATE_PER_MINUTE": "0",
+    "OCR_RATE_PER_MINUTE": "0",
+    "UPSTREAM_COALESCE": "0",
+    "NEAR_DUP_MAX_ENTRIES": "0",
+    "NEWS_SEARCH_CACHE_MAX_ENTRIES": "0",
+}
+
+
+def summarize(timings_ms: list) -> dict:
+    """Latency percentiles in milliseconds."""
+    ordered = sorted(timings_ms)
+    return {
+        "n": len(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "max_ms": ordered[-1]
+    }
+
+
+def time_calls(fn, inputs, repeat: int = 1) -> list:
+    timings = []
+    for _ in range(repeat):
+        for value in inputs:
+            start = time.perf_counter()
+            fn(value)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _model_hash(model_dir: str) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(model_dir, "*"))):
+        with open(path, "rb") as f:
+            digest.update(os.path.basename(path).encode("utf-8"))
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_articles(vocabulary: list, words: int, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed + words)
+    return [" ".join(rng.choice(vocabulary) for _ in range(words)) for _ in range(count)]
+
+
+def make_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """Build a minimal text PDF with the given number of pages."""
+    line = "The Senate passed the budget bill on Tuesday after weeks of negotiations"
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        text = " ".join(f"({line} {page}.{j}) '" for j in range(lines_per_page))
+        stream = f"BT /F1 10 Tf 50 750 Td 12 TL {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def make_image(width: int, height: int) -> bytes:
+    """Render a photo-sized PNG of article text."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(40, height - 40, 60):
+        draw.text((40, y), "The Senate passed the budget bill on Tuesday after weeks of talks", fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def bench_model(args) -> dict:
+    from ml_inference import load_joblib_models, load_scorer
+
+    vectorizer, _ = load_joblib_models(args.model_dir)
+    vocabulary = [term for term in vectorizer.vocabulary_ if " " not in term]
+    results = {}
+    for kind in ("numpy", "sklearn"):
+        scorer = load_scorer(args.model_dir, kind)
+        per_article = {}
+        for words in LENGTH_BUCKETS:
+            articles = make_articles(vocabulary, words, args.samples)
+            per_article[f"{words}_words"] = summarize(
+                time_calls(lambda text: scorer.score([text]), articles)
+            )
+
+        batched = {}
+        articles = make_articles(vocabulary, 800, max(BATCH_SIZES) * 4)
+        for size in BATCH_SIZES:
+            batches = [articles[i:i + size] for i in range(0, len(articles), size)]
+            start = time.perf_counter()
+            for batch in batches:
+                scorer.score(batch)
+            elapsed = time.perf_counter() - start
+            batched[f"batch_{size}"] = {"articles_per_second": len(articles) / elapsed}
+        results[kind] = {"per_article": per_article, "batched": batched}
+    return results
+
+
+def bench_extraction(args) -> dict:
+    from html_extract import extract_paragraph_text
+    from image_ocr import prepare_image_for_ocr, tesseract_image_to_string
+    from pdf_extract import extract_pdf_text
+
+    fixtures = {"html": [], "pdf": [], "image": []}
+    for mb in (0.1, 1, 5):
+        fixtures["html"].append((f"synthetic_{mb}mb", make_news_page(int(mb * 1024 * 1024))))
+    for pages in (5, 50, 300):
+        fixtures["pdf"].append((f"synthetic_{pages}_pages", make_pdf(pages)))
+    for width, height in ((1200, 1600), (3024, 4032)):
+        fixtures["image"].append((f"synthetic_{width}x{height}", make_image(width, height)))
+
+    if args.fixtures:
+        for path in sorted(glob.glob(os.path.join(args.fixtures, "*"))):
+            kind = {".html": "html", ".htm": "html", ".pdf": "pdf", ".png": "image",
+                    ".jpg": "image", ".jpeg": "image"}.get(os.path.splitext(path)[1].lower())
+            if kind:
+                with open(path, "rb") as f:
+                    data = f.read()
+                fixtures[kind].append((os.path.basename(path),
+                                       data.decode("utf-8", "replace") if kind == "html" else data))
+
+    results = {"html": {}, "pdf": {}, "image": {}}
+    for name, page_html in fixtures["html"]:
+        results["html"][name] = {
+            "bytes": len(page_html),
+            **summarize(time_calls(extract_paragraph_text, [page_html], args.repeat))
+        }
+    for name, data in fixtures["pdf"]:
+        results["pdf"][name] = {
+            "bytes": len(data),
+            "chars": len(extract_pdf_text(data)),
+            **summarize(time_calls(extract_pdf_text, [data], args.repeat))
+        }
+    has_tesseract = shutil.which("tesseract") is not None
+    for name, data in fixtures["image"]:
+        _, _, stats = prepare_image_for_ocr(data)
+        entry = {
+            "bytes_in": stats["bytes_in"],
+            "bytes_out": stats["bytes_out"],
+            "preprocess": summarize(time_calls(prepare_image_for_ocr, [data], args.repeat))
+        }
+        entry["tesseract"] = (
+            summarize(time_calls(tesseract_image_to_string, [data], 1))
+            if has_tesseract else "skipped: tesseract not installed"
+        )
+        results["image"][name] = entry
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServerProcess:
+    """Run an ASGI app under uvicorn in a subprocess until it reports ready."""
+
+    def __init__(self, module: str, env: dict):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", f"{module}:app", "--port", str(self.port),
+             "--log-level", "warning"],
+            env={**os.environ, **env}, stdout=subprocess.DEVNULL
+        )
+
+    async def wait_ready(self, client, timeout: float = 60.0) -> float:
+        start = time.perf_counter()
+        while time.perf_counter() - start < timeout:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server on port {self.port} exited with {self.process.returncode}")
+            try:
+                if (await client.get(f"{self.url}/api/ready")).status_code == 200:
+                    return time.perf_counter() - start
+            except Exception:
+                pass
+            await asyncio.sleep(0.1)
+        raise RuntimeError(f"Server on port {self.port} did not become ready")
+
+    def stop(self) -> None:
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+async def _load(client, make_request, requests: int, concurrency: int) -> dict:
+    """Issue requests with bounded concurrency and summarize their latency."""
+    timings = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "requests_per_second": requests / elapsed,
+        **summarize(timings)
+    }
+
+
+async def _bench_endpoints(args) -> dict:
+    import httpx
+
+    stub = StubServer(latency_ms=parse_latency(args.stub_latency)).start()
+    common_env = {"WARMUP": "blocking", "VERDICT_CACHE_BACKEND": "none", "MODEL_DIR": args.model_dir}
+    app_env = dict(common_env)
+    if not args.upstream_limits:
+        # Rate limits, coalescing and result reuse would measure the throttle and the
+        # caches rather than the server
+        app_env.update(UNLIMITED_UPSTREAM_ENV)
+    servers = {
+        "ml_app": ServerProcess("ml_app", common_env),
+        "app": ServerProcess("app", {**app_env, **stub.env()})
+    }
+    article = ("The Senate passed the budget bill on Tuesday after weeks of negotiations "
+               "between lawmakers and the White House, officials said. ") * 8
+    pdf = make_pdf(5)
+    image = make_image(1200, 1600)
+
+    def unique(i):
+        # Distinct text per request so no cache can answer it
+        return f"{article} Request {i}."
+
+    cases = {
+        "predict_text": ("ml_app", lambda c, url, i: c.post(f"{url}/api/predict", data={"text": unique(i)})),
+        "verify_text": ("app", lambda c, url, i: c.post(f"{url}/api/verify", data={"text": unique(i)})),
+        "verify_url": ("app", lambda c, url, i: c.post(
+            f"{url}/api/verify", data={"text": f"URL: {stub.url}/article/{i}"})),
+        "verify_pdf": ("app", lambda c, url, i: c.post(
+            f"{url}/api/verify", files={"file": (f"{i}.pdf", pdf, "application/pdf")})),
+        "verify_image": ("app", lambda c, url, i: c.post(
+            f"{url}/api/verify", files={"file": (f"{i}.png", image, "image/png")})),
+    }
+
+    results = {"stub_latency_ms": stub.latency_ms, "app_env": app_env}
+    try:
+        async with httpx.AsyncClient(timeout=120) as client:
+            results["startup_seconds"] = {
+                name: await server.wait_ready(client) for name, server in servers.items()
+            }
+            for name, (server_name, request) in cases.items():
+                url = servers[server_name].url
+                results[name] = await _load(
+                    client, lambda c, i, request=request, url=url: request(c, url, i),
+                    args.requests, args.concurrency
+                )
+    finally:
+        for server in servers.values():
+            server.stop()
+        stub.stop()
+    results["stub_requests"] = stub.requests
+    return results
+
+
+def bench_endpoints(args) -> dict:
+    return asyncio.run(_bench_endpoints(args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the model, text extraction and API endpoints.")
+    parser.add_argument("-o", "--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--only", default=",".join(SECTIONS), help="Comma-separated sections to run")
+    parser.add_argument("--model-dir", default="Model")
+    parser.add_argument("--fixtures", help="Directory of extra .html/.pdf/.png/.jpg fixtures")
+    parser.add_argument("--samples", type=int, default=200, help="Articles per length bucket")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per extraction fixture")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint case")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stub-latency", default="", help="Stub latency overrides, e.g. gemini=800,ocr=300")
+    parser.add_argument("--upstream-limits", action="store_true",
+                        help="Keep upstream rate limits, call coalescing, near-duplicate reuse and "
+                             "the news search cache on in the endpoint benchmark")
+    args = parser.parse_args()
+
+    sections = [name for name in args.only.split(",") if name]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"Unknown sections: {', '.join(sorted(unknown))}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "model_hash": _model_hash(args.model_dir),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args)
+        }
+    }
+    runners = {"model": bench_model, "extraction": bench_extraction, "endpoints": bench_endpoints}
+    for name in sections:
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        start = time.perf_counter()
+        report[name] = runners[name](args)
+        print(f"  done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
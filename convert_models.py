@@ -1,12 +1,33 @@
+import argparse
 import base64
 import joblib
 
+from model_artifact import ARTIFACT_NAME, export_artifact
+
 def convert_model_to_base64(model_path):
     """Convert a model file to base64 string."""
     with open(model_path, 'rb') as f:
         return base64.b64encode(f.read()).decode('utf-8')
 
+def convert_models_to_compact(model_dir='Model'):
+    """Write the compact memory-mappable artifact next to the joblib models."""
+    vectorizer = joblib.load(f'{model_dir}/tfidf_vectorizer.joblib')
+    model = joblib.load(f'{model_dir}/fake_news_model.joblib')
+    output = f'{model_dir}/{ARTIFACT_NAME}'
+    export_artifact(vectorizer, model, output)
+    print(f"Compact model artifact saved to {output}")
+
 def main():
+    parser = argparse.ArgumentParser(description="Convert models for serverless deployment.")
+    parser.add_argument('--format', choices=['base64', 'compact'], default='base64',
+                        help="base64 text files (legacy) or the compact memory-mappable artifact")
+    parser.add_argument('--model-dir', default='Model', help="Directory holding the joblib models (compact only)")
+    args = parser.parse_args()
+
+    if args.format == 'compact':
+        convert_models_to_compact(args.model_dir)
+        return
+
     # Convert vectorizer
     vectorizer_base64 = convert_model_to_base64('model/vectorizer.pkl')
     with open('vectorizer_base64.txt', 'w') as f:
@@ -20,4 +41,4 @@ def main():
     print("Model converted and saved to model_base64.txt")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
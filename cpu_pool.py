@@ -0,0 +1,151 @@
+"""Bounded process pool for CPU-bound request work (OCR, PDF parsing, inference).
+
+Work submitted from async handlers runs in worker processes so the event
+loop keeps answering health checks and small requests. Once all workers are
+busy and the queue is full, new work is rejected with a 503 instead of piling
+up behind a backlog of large uploads.
+
+If a worker dies (or the pool breaks for any other reason), the executor is
+replaced, the affected requests get a 503, and the pool reports
+``restarting`` until the new workers answer.
+"""
+import asyncio
+import gc
+import os
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 1)))
+CPU_POOL_QUEUE = int(os.getenv("CPU_POOL_QUEUE", "32"))
+
+
+def _noop() -> None:
+    pass
+
+
+def _run_task(fn: Callable, *args):
+    """Worker entry point; errors are re-raised as RuntimeError so they always unpickle."""
+    try:
+        return fn(*args)
+    except Exception as e:
+        raise RuntimeError(str(e) or type(e).__name__) from None
+
+
+class CpuPool:
+    """Process pool with a cap on queued work.
+
+    ``max_workers=0`` runs tasks in threads instead, for environments where
+    worker processes are unavailable.
+    """
+
+    def __init__(self, max_workers: int = CPU_POOL_WORKERS, max_queue: int = CPU_POOL_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        # "running", "restarting" (replacement workers starting) or "broken"
+        self.state = "running"
+        self._executor: Optional[Executor] = None
+
+    @property
+    def capacity(self) -> int:
+        return max(1, self.max_workers) + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.max_workers > 0:
+                # Keep the collector from writing to objects the workers inherit
+                # (vocabulary dicts, imported modules), so those pages stay shared
+                gc.freeze()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+        return self._executor
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == "running"
+
+    def _replace_executor(self, broken: Executor, error: Exception) -> None:
+        """Swap out a broken executor; concurrent callers only replace it once."""
+        if self._executor is not broken:
+            return
+        self.restarts += 1
+        self.last_error = str(error) or type(error).__name__
+        self.state = "restarting"
+        print(f"CPU pool broken ({self.last_error}); starting new workers")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._get_executor().submit(_noop).add_done_callback(self._restarted)
+
+    def _restarted(self, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self.state = "broken"
+        else:
+            self.state = "running"
+
+    async def run(self, fn: Callable, *args, reject_when_busy: bool = True):
+        """Run fn(*args) in the pool and await its result.
+
+        Raises a 503 HTTPException when the pool is saturated, unless
+        ``reject_when_busy`` is False (for bulk work that should wait instead).
+        """
+        if reject_when_busy and self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy processing other requests. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
+        self.in_flight += 1
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_run_task, fn, *args)
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            # Not retried: the task may be what crashed the worker
+            self._replace_executor(executor, e)
+            raise HTTPException(
+                status_code=503,
+                detail="A worker process failed. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+        finally:
+            self.in_flight -= 1
+
+    def start(self) -> None:
+        """Start the workers now rather than on the first request.
+
+        Forked workers inherit whatever the parent has already imported or
+        loaded, so call this after warming up the parent.
+        """
+        executor = self._get_executor()
+        futures = [executor.submit(_noop) for _ in range(max(1, self.max_workers))]
+        for future in futures:
+            future.result()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.state = "running"
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "state": self.state,
+            "restarts": self.restarts,
+            "last_error": self.last_error
+        }
+
+
+cpu_pool = CpuPool()
@@ -125,24 +125,22 @@ function App() {
 
             console.log('Sending request to backend...');
             
-            // Add timeout to fetch request
+            // Abort if the server goes quiet; the timer is reset by every streamed event
             const controller = new AbortController();
-            const timeoutId = setTimeout(() => controller.abort(), 30000); // 30 second timeout
+            let timeoutId = setTimeout(() => controller.abort(), 30000); // 30 second timeout
             
-            const response = await fetch('http://localhost:8000/api/verify', {
+            const response = await fetch('http://localhost:8000/api/verify/stream', {
                 method: 'POST',
                 body: formData,
                 signal: controller.signal,
                 mode: 'cors',
             });
-            
-            clearTimeout(timeoutId);
 
             console.log('Response status:', response.status);
-            const responseText = await response.text();
-            console.log('Response text:', responseText);
 
             if (!response.ok) {
+                clearTimeout(timeoutId);
+                const responseText = await response.text();
                 let errorMessage;
                 try {
                     const errorData = JSON.parse(responseText);
@@ -153,8 +151,48 @@ function App() {
                 throw new Error(errorMessage);
             }
 
-            const data = JSON.parse(responseText);
-            setResult(data);
+            // Render the report as server-sent events arrive: the verdict first, then the text
+            let partial = { verification: '', verdict: null, confidence: null, streaming: true };
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let finished = false;
+            try {
+                while (!finished) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    clearTimeout(timeoutId);
+                    timeoutId = setTimeout(() => controller.abort(), 30000);
+                    buffer += decoder.decode(value, { stream: true });
+
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                        const block = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        const event = (block.match(/^event: (.*)$/m) || [])[1];
+                        const data = JSON.parse((block.match(/^data: (.*)$/m) || [])[1] || '{}');
+
+                        if (event === 'meta') {
+                            partial = { ...partial, ...data };
+                        } else if (event === 'verdict') {
+                            partial = { ...partial, verdict: data.verdict, confidence: data.confidence };
+                        } else if (event === 'chunk') {
+                            partial = { ...partial, verification: partial.verification + data.text };
+                        } else if (event === 'done') {
+                            partial = { ...partial, ...data, streaming: false };
+                            finished = true;
+                        } else if (event === 'error') {
+                            throw new Error(data.detail || 'Failed to verify the article. Please try again.');
+                        }
+                        setResult(partial);
+                    }
+                }
+            } finally {
+                clearTimeout(timeoutId);
+            }
+            if (!finished) {
+                throw new Error('The connection closed before the report was complete. Please try again.');
+            }
 
             // Clear inputs after successful submission
             setFile(null);
@@ -347,12 +385,20 @@ function App() {
             {result && (
                 <div className="result-card w-full max-w-3xl mt-8">
                     <h2 className="text-xl font-semibold mb-4 text-gray-100">Verification Results</h2>
+                    {result.verdict && (
+                        <p className="text-lg font-semibold mb-4 text-gray-100">
+                            {result.verdict}
+                            {result.confidence !== null && result.confidence !== undefined && ` (${result.confidence}% confidence)`}
+                            {result.tier === 'ml' && ' · local model'}
+                        </p>
+                    )}
                     <div className="prose prose-invert max-w-none">
                         <div dangerouslySetInnerHTML={{ 
                             __html: result.verification.replace(/\n/g, '<br>')
                                 .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
                                 .replace(/- ([^\n]+)/g, '• $1')
                         }} />
+                        {result.streaming && <div className="loading mt-3"></div>}
                     </div>
                 </div>
             )}
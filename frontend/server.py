@@ -1,22 +1,11 @@
-import http.server
-import socketserver
+import os
+import sys
 
-class MyHttpRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def do_GET(self):
-        # Serve index.html for all paths
-        if self.path == '/':
-            self.path = '/index.html'
-        return http.server.SimpleHTTPRequestHandler.do_GET(self)
+# static_server.py lives in the project root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
 
-    def end_headers(self):
-        # Enable CORS
-        self.send_header('Access-Control-Allow-Origin', '*')
-        super().end_headers()
+from static_server import STATIC_PORT, run
 
-PORT = 3000
-Handler = MyHttpRequestHandler
-
-print(f"Starting server on port {PORT}...")
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    print(f"Server running at http://localhost:{PORT}")
-    httpd.serve_forever() 
\ No newline at end of file
+if __name__ == '__main__':
+    run(os.path.dirname(os.path.abspath(__file__)), STATIC_PORT)
@@ -1,9 +1,12 @@
 from fastapi import FastAPI, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import google.generativeai as genai
+import asyncio
 import os
 import httpx
-from lxml import html
+from url_cache import PageCache
+from html_extract import MAX_HTML_BYTES, extract_paragraph_text
+from prompt_budget import PROMPT_FALLBACK_MAX_CHARS, PROMPT_TOKEN_BUDGET, condense
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -21,19 +24,23 @@ app.add_middleware(
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 model = genai.GenerativeModel('gemini-pro')
 
+# Extracted text of recently fetched article URLs
+page_cache = PageCache(
+    max_entries=int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "1000")),
+    fresh_seconds=float(os.getenv("PAGE_CACHE_FRESH_SECONDS", "300"))
+)
+
 async def extract_text_from_url(url):
-    """Extract text from URL using httpx and lxml."""
+    """Extract text from URL using httpx and the shared lxml extractor."""
     try:
-        async with httpx.AsyncClient() as client:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = await client.get(url, headers=headers, timeout=15.0)
-            response.raise_for_status()
-            
-            tree = html.fromstring(response.text)
-            paragraphs = tree.xpath('//p/text()')
-            article_text = ' '.join(p.strip() for p in paragraphs if p.strip())
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        async with httpx.AsyncClient(headers=headers) as client:
+            article_text = await page_cache.fetch_text(
+                client, url, extract_paragraph_text,
+                timeout=15.0, max_bytes=MAX_HTML_BYTES
+            )
             
             if not article_text:
                 raise HTTPException(status_code=400, detail="Could not extract text from URL")
@@ -52,8 +59,13 @@ async def verify_news(
         if not content:
             raise HTTPException(status_code=400, detail="Please provide either URL or text content")
 
+        # Keep the most informative sentences instead of the first 3000 characters
+        # (scored in a thread; with the budget disabled the text is still capped)
+        article, article_stats = await asyncio.to_thread(
+            condense, content, PROMPT_TOKEN_BUDGET, max_chars=PROMPT_FALLBACK_MAX_CHARS
+        )
         prompt = f"""Analyze this news article for authenticity:
-        {content[:3000]}
+        {article}
         
         Provide:
         1. Key claims verification
@@ -67,6 +79,7 @@ async def verify_news(
             "verification": gemini_response.text,
             "metadata": {
                 "content_length": len(content),
+                "article_tokens": article_stats["tokens"],
                 "source": url if url else "Direct text input"
             }
         }
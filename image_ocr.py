@@ -0,0 +1,126 @@
+"""Image preparation and local OCR, kept importable without FastAPI or the models.
+
+Phone screenshots and photos are usually far larger than OCR needs, so
+images are downsampled to OCR_MAX_DIMENSION on the long side, converted to
+grayscale and recompressed before being sent to OCR.space or tesseract.
+Pillow is imported on first use so the API servers start without it.
+"""
+import io
+import os
+import threading
+import time
+
+# Longest image side passed to OCR, in pixels
+OCR_MAX_DIMENSION = int(os.getenv("OCR_MAX_DIMENSION", "2000"))
+OCR_JPEG_QUALITY = int(os.getenv("OCR_JPEG_QUALITY", "85"))
+
+# Formats OCR.space accepts as-is
+OCR_SPACE_FORMATS = {"JPEG", "PNG", "GIF", "BMP", "TIFF"}
+
+
+def _downsample_grayscale(image):
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    if max(image.size) > OCR_MAX_DIMENSION:
+        image.thumbnail((OCR_MAX_DIMENSION, OCR_MAX_DIMENSION), Image.LANCZOS)
+    return image.convert("L")
+
+
+def _encode(image, out_format: str) -> bytes:
+    buffer = io.BytesIO()
+    if out_format == "JPEG":
+        image.save(buffer, format="JPEG", quality=OCR_JPEG_QUALITY, optimize=True)
+    else:
+        image.save(buffer, format=out_format, optimize=True)
+    return buffer.getvalue()
+
+
+def prepare_image_for_ocr(image_content: bytes):
+    """Downsample, grayscale and recompress an image for OCR.
+
+    Returns ``(image_bytes, mime_type, stats)``; the original bytes are kept
+    when recompressing would not make them smaller.
+    """
+    from PIL import Image
+
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(image_content))
+    source_format = image.format or "JPEG"
+    original_size = image.size
+
+    prepared = _downsample_grayscale(image)
+    # Text screenshots can go either way after resampling, so keep the
+    # smaller encoding (or the original upload if it is smaller still)
+    candidates = [("PNG", _encode(prepared, "PNG")), ("JPEG", _encode(prepared, "JPEG"))]
+    if source_format in OCR_SPACE_FORMATS:
+        candidates.append((source_format, image_content))
+    out_format, data = min(candidates, key=lambda candidate: len(candidate[1]))
+
+    stats = {
+        "bytes_in": len(image_content),
+        "bytes_out": len(data),
+        "source_format": source_format,
+        "original_size": original_size,
+        "size": prepared.size,
+        "preprocess_seconds": time.perf_counter() - start
+    }
+    return data, Image.MIME.get(out_format, "image/jpeg"), stats
+
+
+def tesseract_image_to_string(image_content: bytes):
+    """Run tesseract over a downsampled grayscale copy of an encoded image.
+
+    Returns ``(text, stats)`` so the caller can record OCR metrics.
+    """
+    import pytesseract
+    from PIL import Image
+
+    start = time.perf_counter()
+    image = Image.open(io.BytesIO(image_content))
+    prepared = _downsample_grayscale(image)
+    preprocessed = time.perf_counter()
+    text = pytesseract.image_to_string(prepared).strip()
+    stats = {
+        "bytes_in": len(image_content),
+        "bytes_out": len(image_content),
+        "original_size": image.size,
+        "size": prepared.size,
+        "preprocess_seconds": preprocessed - start,
+        "ocr_seconds": time.perf_counter() - preprocessed
+    }
+    return text, stats
+
+
+class OcrStats:
+    """Running totals of OCR payload sizes and timings."""
+
+    def __init__(self):
+        self.images = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.preprocess_seconds = 0.0
+        self.ocr_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, stats: dict) -> None:
+        with self._lock:
+            self.images += 1
+            self.bytes_in += stats.get("bytes_in", 0)
+            self.bytes_out += stats.get("bytes_out", 0)
+            self.preprocess_seconds += stats.get("preprocess_seconds", 0.0)
+            self.ocr_seconds += stats.get("ocr_seconds", 0.0)
+
+    def snapshot(self) -> dict:
+        images = self.images or 1
+        return {
+            "images": self.images,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "avg_preprocess_ms": self.preprocess_seconds / images * 1000,
+            "avg_ocr_ms": self.ocr_seconds / images * 1000
+        }
+
+
+ocr_stats = OcrStats()
@@ -0,0 +1,281 @@
+"""Per-stage latency histograms, upstream error counters and a /metrics exporter.
+
+Request handlers wrap their work in ``trace_request`` and each step in
+``span``; the current trace travels in a context variable, so helpers (and
+tasks they create) add spans without passing it around. Every span feeds the
+``fnd_stage_seconds`` histogram labelled by stage and input type (text, url,
+pdf, image, batch), and each finished request is logged as one JSON line
+(METRICS_LOG_REQUESTS=0 turns that off). ``registry.render()`` produces the
+Prometheus text exposition format.
+"""
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+METRICS_LOG_REQUESTS = os.getenv("METRICS_LOG_REQUESTS", "1") != "0"
+
+# Upper bounds in seconds; LLM and OCR calls can take tens of seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value:g}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            labels = _format_labels(self.labelnames, key)
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, key, 'le="%g"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            cumulative += counts[-1]
+            bucket_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {total:.6f}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter read from a callback at scrape time, e.g. pool or cache stats.
+
+    With ``labelnames`` the callback returns a dict of label values -> value.
+    """
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float], kind: str = "gauge",
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.read = read
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list:
+        try:
+            if not self.labelnames:
+                return [f"{self.name} {float(self.read()):g}"]
+            items = sorted(self.read().items())
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {float(value):g}"
+                    for key, value in items]
+        except Exception:
+            return []
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        # Both apps share these module-level metrics, so registration is idempotent
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, read: Callable[[], float],
+                 kind: str = "gauge", labelnames: Sequence[str] = ()) -> CallbackMetric:
+        # Replaced on re-registration so the callback refers to the latest object
+        self._metrics[name] = CallbackMetric(name, help_text, read, kind, labelnames)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram(
+    "fnd_request_seconds", "End-to-end request latency.", ("endpoint", "input_type", "status")
+)
+STAGE_SECONDS = registry.histogram(
+    "fnd_stage_seconds", "Latency of each request stage.", ("stage", "input_type")
+)
+UPSTREAM_ERRORS = registry.counter(
+    "fnd_upstream_errors_total", "Failed calls to upstream services.", ("upstream", "reason")
+)
+
+
+class RequestTrace:
+    """Spans recorded while handling one request."""
+
+    def __init__(self, endpoint: str, input_type: str = "unknown"):
+        self.endpoint = endpoint
+        self.input_type = input_type
+        self.status = "200"
+        self.spans = []
+        self.start = time.perf_counter()
+        self.finished = False
+
+    def finish(self) -> None:
+        """Record the total latency and log the spans; only the first call counts."""
+        if self.finished:
+            return
+        self.finished = True
+        total = time.perf_counter() - self.start
+        REQUEST_SECONDS.observe(total, endpoint=self.endpoint, input_type=self.input_type,
+                                status=self.status)
+        if METRICS_LOG_REQUESTS:
+            print(json.dumps({
+                "event": "request",
+                "endpoint": self.endpoint,
+                "input_type": self.input_type,
+                "status": self.status,
+                "total_ms": round(total * 1000, 1),
+                "spans_ms": [[stage, round(duration * 1000, 1)] for stage, duration in self.spans]
+            }))
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+def set_input_type(input_type: str) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.input_type = input_type
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record a stage duration measured by the caller."""
+    trace = _current_trace.get()
+    input_type = trace.input_type if trace is not None else "unknown"
+    STAGE_SECONDS.observe(seconds, stage=stage, input_type=input_type)
+    if trace is not None:
+        trace.spans.append((stage, seconds))
+
+
+@contextmanager
+def span(stage: str):
+    """Time a stage of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def trace_request(endpoint: str, input_type: str = "unknown", finish_on_exit: bool = True):
+    """Record a request's total latency and log its spans as one JSON line.
+
+    With ``finish_on_exit=False`` a block that succeeds leaves the trace open,
+    for a streamed response that continues it with iterate_traced() and
+    calls finish() when done. Errors always finish it.
+    """
+    trace = RequestTrace(endpoint, input_type)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    except Exception as e:
+        trace.status = str(getattr(e, "status_code", 500))
+        trace.finish()
+        raise
+    else:
+        if finish_on_exit:
+            trace.finish()
+    finally:
+        _current_trace.reset(token)
+
+
+async def iterate_traced(trace: RequestTrace, iterator: AsyncIterator) -> AsyncIterator:
+    """Iterate an async generator with ``trace`` as the current trace for each step.
+
+    A streaming response body runs after its handler has returned, in
+    whatever context the server iterates it from, so the trace is bound
+    explicitly around every step instead of being left set across yields.
+    """
+    try:
+        while True:
+            token = _current_trace.set(trace)
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                _current_trace.reset(token)
+            yield item
+    finally:
+        token = _current_trace.set(trace)
+        try:
+            await iterator.aclose()
+        finally:
+            _current_trace.reset(token)
+
+
+def record_upstream_error(upstream: str, reason: str) -> None:
+    UPSTREAM_ERRORS.inc(upstream=upstream, reason=reason)
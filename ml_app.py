@@ -1,17 +1,27 @@
-from fastapi import FastAPI, Form, HTTPException, UploadFile, File
-from fastapi.middleware.cors import CORSMiddleware
-import joblib
 import os
 import base64
 import json
-from PyPDF2 import PdfReader
-from PIL import Image
-import pytesseract
-import io
+from functools import partial
+from startup import LazyResource, readiness, startup_report, warm_up
+
+with startup_report.phase("import fastapi"):
+    from fastapi import FastAPI, Form, HTTPException, UploadFile, File, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+with startup_report.phase("import app modules"):
+    from ml_inference import MicroBatcher, iter_json_records, load_scorer, score_with_models
+    from pdf_extract import extract_pdf_text_in_pool
+    from image_ocr import ocr_stats, tesseract_image_to_string
+    from cpu_pool import cpu_pool
+    from metrics import registry, set_input_type, span, trace_request
+    from uploads import UploadLimitMiddleware, read_upload
 
 # Initialize FastAPI app
 app = FastAPI()
 
+# Oversized uploads (MAX_UPLOAD_BYTES) are refused before the form is parsed
+app.add_middleware(UploadLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -21,44 +31,85 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load ML model and vectorizer from files
-try:
-    vectorizer = joblib.load('models/tfidf_vectorizer.joblib')
-    clf = joblib.load('models/fake_news_model.joblib')
-except Exception as e:
-    print(f"Error loading models: {e}")
-    print("Please ensure the model files exist in the 'models' directory")
-    raise
+# Directory with the compact artifact and/or joblib models
+MODEL_DIR = os.getenv("MODEL_DIR", "Model")
+
+def _load_scorer():
+    try:
+        return load_scorer(MODEL_DIR)
+    except Exception as e:
+        print(f"Error loading models: {e}")
+        print(f"Please ensure the model files exist in the '{MODEL_DIR}' directory")
+        raise
+
+def _import_pdf_and_ocr():
+    import PyPDF2
+    import PIL.Image
+    import pytesseract
+
+# The scorer and libraries are loaded in this process before the pool is
+# started, so forked workers inherit them instead of loading their own copy
+components = [
+    LazyResource("scorer", _load_scorer),
+    LazyResource("pdf_ocr_libraries", _import_pdf_and_ocr),
+    LazyResource("cpu_pool", cpu_pool.start)
+]
+
+@app.on_event("startup")
+async def warm_up_components():
+    await warm_up(components)
+
+# Micro-batching settings for /api/predict
+ML_BATCH_MAX_SIZE = int(os.getenv("ML_BATCH_MAX_SIZE", "32"))
+ML_BATCH_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "5"))
+# Number of articles vectorized together by /api/predict/batch
+ML_BATCH_CHUNK_SIZE = int(os.getenv("ML_BATCH_CHUNK_SIZE", "256"))
+
+batcher = MicroBatcher(
+    partial(score_with_models, MODEL_DIR),
+    max_batch_size=ML_BATCH_MAX_SIZE,
+    max_wait_ms=ML_BATCH_MAX_WAIT_MS,
+    runner=cpu_pool.run
+)
+
+@app.on_event("shutdown")
+async def shutdown_batcher():
+    await batcher.close()
+    cpu_pool.shutdown()
 
 async def extract_text_from_file(file: UploadFile):
     """Extract text from PDF or image file."""
-    content = await file.read()
+    # Size-limited read; the type comes from the file's magic bytes
+    with span("read_upload"):
+        file_type, content = await read_upload(file)
     
-    if file.content_type == "application/pdf":
-        # Handle PDF
-        pdf = PdfReader(io.BytesIO(content))
-        text = ""
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    elif file.content_type.startswith("image/"):
-        # Handle Image
-        image = Image.open(io.BytesIO(content))
-        text = pytesseract.image_to_string(image)
+    if file_type == "pdf":
+        # Handle PDF, stopping once enough text has been collected
+        with span("extract_pdf"):
+            text = await extract_pdf_text_in_pool(content, cpu_pool)
         return text.strip()
     else:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
+        # Handle Image (downsampled and OCR'd in a worker process)
+        with span("ocr_tesseract"):
+            text, stats = await cpu_pool.run(tesseract_image_to_string, content)
+        ocr_stats.record(stats)
+        return text
 
 @app.post("/api/predict")
 async def predict_news(
     text: str = Form(None),
     file: UploadFile = File(None)
 ):
+    with trace_request("/api/predict"):
+        return await _predict_news(text, file)
+
+async def _predict_news(text: str, file: UploadFile):
     try:
         # Get content from either text or file
         if file:
             content = await extract_text_from_file(file)
         elif text:
+            set_input_type("text")
             content = text
         else:
             raise HTTPException(status_code=400, detail="Please provide either text or file")
@@ -66,20 +117,119 @@ async def predict_news(
         if len(content.strip()) < 50:
             raise HTTPException(status_code=400, detail="Extracted text is too short")
 
-        # ML Model prediction
-        X = vectorizer.transform([content])
-        prediction = clf.predict(X)[0]
-        confidence = max(clf.predict_proba(X)[0])
+        # ML Model prediction (batched with concurrent requests)
+        with span("classify"):
+            result = await batcher.submit(content)
         
         return {
-            "prediction": "Real" if prediction == 1 else "Fake",
-            "confidence": float(confidence),
+            "prediction": result["prediction"],
+            "confidence": result["confidence"],
             "extracted_text": content[:500] + "..." if len(content) > 500 else content
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _article_from_record(record, index):
+    """Normalize a batch record into (id, text)."""
+    if isinstance(record, str):
+        return index, record
+    if isinstance(record, dict):
+        text = record.get("text") or record.get("content") or ""
+        return record.get("id", index), text if isinstance(text, str) else ""
+    return index, ""
+
+async def _score_chunk(chunk):
+    """Score one chunk of (id, text) pairs in the CPU pool."""
+    valid = [i for i, (_, text) in enumerate(chunk) if len(text.strip()) >= 50]
+    scores = {}
+    if valid:
+        # Bulk requests wait for pool capacity instead of being rejected
+        with span("classify_chunk"):
+            results = await cpu_pool.run(
+                score_with_models, MODEL_DIR, [chunk[i][1] for i in valid],
+                reject_when_busy=False
+            )
+        scores = dict(zip(valid, results))
+
+    lines = []
+    for i, (article_id, _) in enumerate(chunk):
+        if i in scores:
+            row = {"id": article_id, **scores[i]}
+        else:
+            row = {"id": article_id, "error": "Extracted text is too short"}
+        lines.append(json.dumps(row) + "\n")
+    return "".join(lines)
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse that leaves the request body to the body iterator.
+
+    StreamingResponse normally polls ``receive`` for disconnects while
+    streaming, which would swallow request body messages that the iterator
+    is still reading.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+@app.post("/api/predict/batch")
+async def predict_batch(request: Request):
+    """Score a JSON array or NDJSON stream of articles, streaming NDJSON results."""
+    async def results():
+        chunk = []
+        index = 0
+        with trace_request("/api/predict/batch", "batch"):
+            try:
+                async for record in iter_json_records(request.stream()):
+                    chunk.append(_article_from_record(record, index))
+                    index += 1
+                    if len(chunk) >= ML_BATCH_CHUNK_SIZE:
+                        yield await _score_chunk(chunk)
+                        chunk = []
+                if chunk:
+                    yield await _score_chunk(chunk)
+            except ValueError as e:
+                # Headers are already sent, so report malformed input in-band
+                if chunk:
+                    yield await _score_chunk(chunk)
+                yield json.dumps({"error": f"Invalid batch input: {str(e)}"}) + "\n"
+
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+registry.callback("fnd_cpu_pool_in_flight", "Tasks running or queued in the CPU pool.",
+                  lambda: cpu_pool.in_flight)
+registry.callback("fnd_cpu_pool_rejected_total", "Tasks rejected because the CPU pool was full.",
+                  lambda: cpu_pool.rejected, kind="counter")
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage latency histograms."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/ocr/stats")
+async def ocr_statistics():
+    """Report average image preprocessing and tesseract time."""
+    return ocr_stats.snapshot()
+
+@app.get("/api/ready")
+async def ready_check():
+    """Readiness endpoint: which components are loaded, plus startup timings."""
+    ready, body = readiness(components)
+    # A pool that is replacing crashed workers cannot take work yet
+    body["cpu_pool"] = cpu_pool.stats()
+    if not cpu_pool.healthy:
+        ready = False
+        body["status"] = cpu_pool.state
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+@app.get("/api/health")
+async def health_check():
+    """Health check endpoint; answered on the event loop even while the pool is busy."""
+    status = "healthy" if cpu_pool.healthy else "degraded"
+    return {"status": status, "cpu_pool": cpu_pool.stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Fast first tier for /api/verify: the local TF-IDF classifier.
+
+In tiered mode an article is scored by the local model first. When the model
+is confident enough (its probability that the article is real is at least
+ML_GATE_REAL_ABOVE, or at most ML_GATE_FAKE_BELOW) its verdict is returned
+directly; otherwise the request escalates to Gemini with the model's score
+included in the prompt.
+"""
+import os
+from typing import Optional
+
+# "llm" always asks Gemini; "tiered" lets confident ML verdicts answer directly
+VERIFY_MODE = os.getenv("VERIFY_MODE", "llm")
+ML_GATE_REAL_ABOVE = float(os.getenv("ML_GATE_REAL_ABOVE", "0.95"))
+ML_GATE_FAKE_BELOW = float(os.getenv("ML_GATE_FAKE_BELOW", "0.05"))
+
+VERIFY_MODES = ("llm", "tiered")
+
+
+def real_probability(result: dict) -> float:
+    """Probability that the article is real, from a scorer result."""
+    if result["prediction"] == "Real":
+        return result["confidence"]
+    return 1.0 - result["confidence"]
+
+
+def gate_verdict(result: dict, real_above: float = ML_GATE_REAL_ABOVE,
+                 fake_below: float = ML_GATE_FAKE_BELOW) -> Optional[str]:
+    """Return "REAL" or "FAKE" when the score clears a threshold, else None."""
+    p_real = real_probability(result)
+    if p_real >= real_above:
+        return "REAL"
+    if p_real <= fake_below:
+        return "FAKE"
+    return None
+
+
+def format_ml_report(verdict: str, result: dict) -> str:
+    """Render an ML verdict in the same numbered format as the Gemini reports."""
+    return f"""1. VERDICT: {verdict}
+2. CONFIDENCE: {result['confidence']:.0%}
+3. KEY CLAIMS:
+   - Not analyzed (answered by the local classifier)
+
+4. CROSS-REFERENCES:
+   - None (answered by the local classifier)
+
+5. RED FLAGS (if any):
+   - None identified
+
+6. TIMELINESS:
+   - Not assessed
+
+Scored by the local TF-IDF model without an LLM review. Resubmit in "llm" mode for a full report."""
+
+
+def ml_prompt_note(result: dict) -> str:
+    """Sentence added to the Gemini prompt for articles the gate escalated."""
+    return (
+        f"A local text classifier rated this article {result['prediction'].upper()} "
+        f"with {result['confidence']:.0%} confidence, which was not conclusive. "
+        "Treat this only as a weak signal."
+    )
@@ -0,0 +1,294 @@
+import asyncio
+import codecs
+import collections
+import json
+import os
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+# Largest single JSON record accepted by iter_json_records
+MAX_RECORD_CHARS = 10 * 1024 * 1024
+
+
+# Models and scorers loaded in this process, keyed by model directory
+_loaded_models = {}
+_loaded_scorers = {}
+
+# "auto" prefers the compact artifact when the model directory has one
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "auto")
+# "numpy" scores without sklearn at request time; "sklearn" uses the estimators
+ML_SCORER = os.getenv("ML_SCORER", "numpy")
+
+
+def _artifact_path(model_dir: str) -> Optional[str]:
+    """Return the compact artifact to load for model_dir, if any."""
+    from model_artifact import ARTIFACT_NAME
+
+    path = os.path.join(model_dir, ARTIFACT_NAME)
+    if MODEL_FORMAT == "compact" or (MODEL_FORMAT == "auto" and os.path.exists(path)):
+        return path
+    return None
+
+
+def load_joblib_models(model_dir: str):
+    """Unpickle the vectorizer and classifier saved by the training script."""
+    import joblib
+
+    vectorizer = joblib.load(os.path.join(model_dir, "tfidf_vectorizer.joblib"))
+    clf = joblib.load(os.path.join(model_dir, "fake_news_model.joblib"))
+    return vectorizer, clf
+
+
+def load_models(model_dir: str):
+    """Load (and cache per process) the vectorizer and classifier in model_dir."""
+    if model_dir not in _loaded_models:
+        from model_artifact import load_artifact
+
+        artifact_path = _artifact_path(model_dir)
+        if artifact_path:
+            _loaded_models[model_dir] = load_artifact(artifact_path).to_sklearn()
+        else:
+            _loaded_models[model_dir] = load_joblib_models(model_dir)
+    return _loaded_models[model_dir]
+
+
+class SklearnScorer:
+    """Scorer interface over a fitted vectorizer and classifier."""
+
+    def __init__(self, vectorizer, clf):
+        self.vectorizer = vectorizer
+        self.clf = clf
+
+    def predict_proba(self, texts: List[str]):
+        return self.clf.predict_proba(self.vectorizer.transform(texts))
+
+    def score(self, texts: List[str]) -> List[dict]:
+        return score_texts(self.vectorizer, self.clf, texts)
+
+
+def load_scorer(model_dir: str, kind: Optional[str] = None):
+    """Load (and cache per process) a scorer for the models in model_dir.
+
+    ``kind`` is "numpy" or "sklearn" and defaults to ML_SCORER. The NumPy
+    scorer built from the compact artifact never imports sklearn.
+    """
+    kind = kind or ML_SCORER
+    key = (model_dir, kind)
+    if key not in _loaded_scorers:
+        if kind == "sklearn":
+            _loaded_scorers[key] = SklearnScorer(*load_models(model_dir))
+        elif kind == "numpy":
+            from model_artifact import load_artifact
+            from numpy_scorer import NumpyScorer
+
+            artifact_path = _artifact_path(model_dir)
+            if artifact_path:
+                _loaded_scorers[key] = NumpyScorer.from_artifact(load_artifact(artifact_path))
+            else:
+                _loaded_scorers[key] = NumpyScorer.from_sklearn(*load_joblib_models(model_dir))
+        else:
+            raise ValueError(f"Unknown scorer: {kind}")
+    return _loaded_scorers[key]
+
+
+def score_with_models(model_dir: str, texts: List[str]) -> List[dict]:
+    """Score texts with the models in model_dir; safe to send to pool workers."""
+    return load_scorer(model_dir).score(texts)
+
+
+def score_texts(vectorizer, clf, texts: List[str]) -> List[dict]:
+    """Score a batch of articles with one transform and one predict_proba call."""
+    X = vectorizer.transform(texts)
+    proba = clf.predict_proba(X)
+    best = proba.argmax(axis=1)
+    labels = clf.classes_[best]
+
+    results = []
+    for i, label in enumerate(labels):
+        results.append({
+            "prediction": "Real" if label == 1 else "Fake",
+            "confidence": float(proba[i, best[i]])
+        })
+    return results
+
+
+async def _run_in_thread(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+class MicroBatcher:
+    """Collect concurrent scoring requests and run them as a single batch.
+
+    Requests are held for at most ``max_wait_ms`` after the first one arrives,
+    or until ``max_batch_size`` requests are queued, and are then scored by
+    ``runner`` (a worker thread by default) so the event loop keeps serving
+    other requests.
+    """
+
+    def __init__(self, score_fn: Callable[[List[str]], List[dict]],
+                 max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 runner: Optional[Callable[..., Awaitable]] = None):
+        self.score_fn = score_fn
+        self.runner = runner or _run_in_thread
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._pending = collections.deque()
+        self._arrived = None
+        self._worker = None
+
+    async def submit(self, text: str) -> dict:
+        """Queue one article and wait for its batched result."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._arrived = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self._arrived.set()
+        return await future
+
+    async def close(self) -> None:
+        """Stop the worker task and fail any requests still waiting."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._pending:
+            _, future = self._pending.popleft()
+            if not future.done():
+                future.cancel()
+
+    def _take(self, batch: list) -> None:
+        while self._pending and len(batch) < self.max_batch_size:
+            batch.append(self._pending.popleft())
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        while not self._pending:
+            self._arrived.clear()
+            await self._arrived.wait()
+
+        batch = []
+        self._take(batch)
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+            self._take(batch)
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Drop requests whose handlers have already gone away
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                results = await self.runner(self.score_fn, [text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def _parse_array_records(buffer: str, pos: int, decoder: json.JSONDecoder, final: bool):
+    """Decode complete array elements from buffer; returns (records, pos, closed)."""
+    records = []
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buffer):
+            return records, pos, False
+        if buffer[pos] == "]":
+            return records, pos + 1, True
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Invalid JSON array element at character {pos}")
+            return records, pos, False
+        if end >= len(buffer) and not final:
+            # A trailing scalar may still be incomplete, wait for more input
+            return records, pos, False
+        records.append(record)
+        pos = end
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[object]:
+    """Incrementally parse a JSON array or NDJSON byte stream into records.
+
+    Only the unparsed tail of the input is kept in memory, so arbitrarily
+    large request bodies can be consumed record by record. Records are
+    yielded as they are parsed, so everything before a malformed element or
+    line is still produced before the ValueError is raised.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    decoder = json.JSONDecoder()
+    buffer = ""
+    mode = None
+    closed = False
+    line_number = 0
+
+    def drain(final: bool):
+        nonlocal buffer, mode, closed, line_number
+        if mode is None:
+            stripped = buffer.lstrip()
+            if not stripped:
+                return
+            mode = "array" if stripped[0] == "[" else "lines"
+            # Blank lines before the first record still count for error messages
+            line_number = buffer[:len(buffer) - len(stripped)].count("\n")
+            buffer = stripped[1:] if mode == "array" else stripped
+
+        if mode == "array":
+            if closed:
+                if buffer.strip():
+                    raise ValueError("Unexpected data after JSON array")
+                return
+            records, pos, closed = _parse_array_records(buffer, 0, decoder, final)
+            buffer = buffer[pos:]
+            yield from records
+            if final and not closed:
+                raise ValueError("Unterminated JSON array")
+        else:
+            lines = buffer.split("\n")
+            buffer = "" if final else lines.pop()
+            for line in lines:
+                line_number += 1
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from None
+                yield record
+
+        if len(buffer) > MAX_RECORD_CHARS:
+            raise ValueError("Single record exceeds maximum size")
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += text_decoder.decode(chunk)
+        for record in drain(final=False):
+            yield record
+
+    buffer += text_decoder.decode(b"", final=True)
+    for record in drain(final=True):
+        yield record
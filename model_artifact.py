@@ -0,0 +1,204 @@
+"""Compact, memory-mappable file format for the TF-IDF + Logistic Regression model.
+
+The pickled joblib files store the vocabulary as a Python dict and need
+scikit-learn to unpickle. This format stores everything as flat arrays in a
+single file:
+
+    magic "FNDMODEL" | uint32 version | uint32 header length | JSON header
+    followed by 64-byte aligned sections:
+      vocab_blob     uint8    UTF-8 terms, sorted, concatenated
+      vocab_offsets  uint32   n_terms + 1 offsets into vocab_blob
+      vocab_columns  int32    feature column of each sorted term
+      idf            float32  per-column IDF weights
+      coef           float32  classifier coefficients
+      intercept      float32  classifier intercepts
+
+The arrays are memory-mapped read-only, so every worker process on a host
+shares the same pages. Export with:
+
+    python model_artifact.py export Model Model/fake_news_compact.bin
+"""
+import argparse
+import json
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+MAGIC = b"FNDMODEL"
+VERSION = 1
+ALIGNMENT = 64
+ARTIFACT_NAME = "fake_news_compact.bin"
+
+# TfidfVectorizer parameters that the artifact records and can reproduce
+VECTORIZER_PARAMS = (
+    "lowercase", "token_pattern", "ngram_range", "norm", "use_idf",
+    "smooth_idf", "sublinear_tf", "binary", "strip_accents"
+)
+
+
+def _padding(length: int) -> int:
+    return -length % ALIGNMENT
+
+
+def export_artifact(vectorizer, clf, path: str, dtype=np.float32) -> dict:
+    """Write a fitted TfidfVectorizer and linear classifier to path."""
+    if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor:
+        raise ValueError("Only word analyzers with the default tokenizer can be exported")
+
+    terms = sorted(vectorizer.vocabulary_)
+    encoded = [term.encode("utf-8") for term in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+
+    stop_words = vectorizer.get_stop_words()
+    header = {
+        "vectorizer": {name: getattr(vectorizer, name) for name in VECTORIZER_PARAMS},
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "n_features": len(terms),
+        "classes": [c.item() if hasattr(c, "item") else c for c in clf.classes_],
+        "sections": {}
+    }
+    sections = [
+        ("vocab_blob", np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+        ("vocab_offsets", offsets),
+        ("vocab_columns", np.array([vectorizer.vocabulary_[t] for t in terms], dtype=np.int32)),
+        ("idf", np.asarray(vectorizer.idf_, dtype=dtype)),
+        ("coef", np.asarray(clf.coef_, dtype=dtype)),
+        ("intercept", np.asarray(clf.intercept_, dtype=dtype)),
+    ]
+
+    # Offsets are relative to the start of the data area, which follows the
+    # header, so they can be computed before the header is serialized
+    position = 0
+    for name, array in sections:
+        header["sections"][name] = {
+            "offset": position,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape)
+        }
+        position += array.nbytes + _padding(array.nbytes)
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix_length = len(MAGIC) + 8 + len(header_bytes)
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * _padding(prefix_length))
+        for _, array in sections:
+            f.write(array.tobytes())
+            f.write(b"\0" * _padding(array.nbytes))
+    return header
+
+
+class CompactModel:
+    """Read-only view of an exported model backed by a memory map."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a compact model artifact")
+        version, header_length = struct.unpack_from("<II", self._mmap, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"Unsupported model artifact version {version}")
+
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start = header_start + header_length
+        data_start += _padding(data_start)
+
+        self.arrays = {}
+        self._column_order = None
+        for name, section in self.header["sections"].items():
+            dtype = np.dtype(section["dtype"])
+            count = int(np.prod(section["shape"]))
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count,
+                                  offset=data_start + section["offset"])
+            self.arrays[name] = array.reshape(section["shape"])
+
+    @property
+    def vectorizer_params(self) -> dict:
+        params = dict(self.header["vectorizer"])
+        params["ngram_range"] = tuple(params["ngram_range"])
+        return params
+
+    @property
+    def classes(self) -> np.ndarray:
+        return np.array(self.header["classes"])
+
+    def terms(self) -> list:
+        """Decode the sorted vocabulary terms."""
+        blob = self.arrays["vocab_blob"].tobytes()
+        offsets = self.arrays["vocab_offsets"]
+        return [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def terms_for_columns(self, columns) -> list:
+        """Decode the terms of the given feature columns straight from the map."""
+        if self._column_order is None:
+            # Position in the sorted term list of each feature column
+            self._column_order = np.argsort(self.arrays["vocab_columns"])
+        blob = self.arrays["vocab_blob"]
+        offsets = self.arrays["vocab_offsets"]
+        positions = self._column_order[np.asarray(columns, dtype=np.intp)]
+        return [blob[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8") for i in positions]
+
+    def vocabulary(self) -> dict:
+        """Return the term -> feature column mapping."""
+        return dict(zip(self.terms(), self.arrays["vocab_columns"].tolist()))
+
+    def to_sklearn(self):
+        """Rebuild an equivalent (TfidfVectorizer, LogisticRegression) pair."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+
+        params = self.vectorizer_params
+        vectorizer = TfidfVectorizer(stop_words=self.header["stop_words"], **params)
+        vectorizer.vocabulary_ = self.vocabulary()
+        vectorizer.idf_ = self.arrays["idf"].astype(np.float64)
+
+        clf = LogisticRegression()
+        clf.classes_ = self.classes
+        clf.coef_ = self.arrays["coef"].astype(np.float64)
+        clf.intercept_ = self.arrays["intercept"].astype(np.float64)
+        clf.n_features_in_ = self.header["n_features"]
+        return vectorizer, clf
+
+
+def load_artifact(path: str) -> CompactModel:
+    """Memory-map a compact model artifact."""
+    return CompactModel(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect compact model artifacts.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export = subparsers.add_parser("export", help="Convert joblib models into a compact artifact")
+    export.add_argument("model_dir", help="Directory with tfidf_vectorizer.joblib and fake_news_model.joblib")
+    export.add_argument("output", help="Artifact path to write")
+    export.add_argument("--float64", action="store_true", help="Store weights as float64 instead of float32")
+    info = subparsers.add_parser("info", help="Print an artifact's header")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from ml_inference import load_joblib_models
+
+        vectorizer, clf = load_joblib_models(args.model_dir)
+        export_artifact(vectorizer, clf, args.output,
+                        dtype=np.float64 if args.float64 else np.float32)
+        print(f"Compact model written to {args.output}")
+    else:
+        model = load_artifact(args.path)
+        header = dict(model.header)
+        header["stop_words"] = len(header["stop_words"] or [])
+        json.dump(header, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Near-duplicate article index (MinHash + LSH) for reusing earlier verdicts.
+
+The exact verdict cache only matches articles whose normalized text is
+identical. Lightly edited copies of a story (another byline, trailing share
+links, OCR noise) are matched here instead: each article is reduced to a
+MinHash signature over character 5-gram shingles, signatures are bucketed by
+LSH bands, and a lookup returns the verdict-cache key of the most similar
+stored article when its estimated Jaccard similarity reaches the threshold.
+
+Memory is bounded by ``max_entries``: signatures live in a ring buffer (the
+oldest entry is overwritten first) and each LSH band is a fixed-size,
+direct-mapped table of slot numbers. A bucket collision or an overwritten
+slot only costs recall, because every candidate is checked against its
+stored signature. Each entry takes 300-500 bytes with the defaults (the band
+tables are rounded up to a power of two).
+"""
+import re
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 63
+# 21 bands of 3 rows: articles at 0.6 similarity share a band with
+# probability 0.99; candidates below the threshold are rejected on their
+# full signature
+BANDS = 21
+SHINGLE_SIZE = 5
+# Only the start of very long documents is shingled
+MAX_SHINGLE_CHARS = 20000
+# Shorter texts have too few shingles for a reliable estimate
+MIN_CHARS = 200
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_NON_WORD = re.compile(r"[\W_]+")
+_permutations = {}
+
+
+def _permutation_params(num_perm: int, seed: int):
+    key = (num_perm, seed)
+    if key not in _permutations:
+        rng = np.random.default_rng(seed)
+        a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)
+        b = rng.integers(0, 2**32, size=num_perm, dtype=np.uint64)
+        _permutations[key] = (a[:, None], b[:, None])
+    return _permutations[key]
+
+
+def normalize(text: str) -> str:
+    """Case-fold and reduce punctuation and whitespace runs to single spaces."""
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct 32-bit hashes of the character shingles of normalized text."""
+    data = np.frombuffer(normalize(text)[:MAX_SHINGLE_CHARS].encode("utf-8"), dtype=np.uint8)
+    if len(data) < size:
+        data = np.pad(data, (0, size - len(data)))
+    count = len(data) - size + 1
+    packed = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        packed |= data[offset:offset + count].astype(np.uint64) << np.uint64(8 * offset)
+    return np.unique((packed * _GOLDEN) >> np.uint64(32))
+
+
+def signature(text: str, num_perm: int = NUM_PERM, seed: int = 1) -> np.ndarray:
+    """MinHash signature, keeping the low 16 bits of each minimum.
+
+    Safe to send to pool workers; the permutations depend only on the seed.
+    """
+    a, b = _permutation_params(num_perm, seed)
+    hashes = shingle_hashes(text)
+    minimums = ((a * hashes + b) % _PRIME).min(axis=1)
+    return (minimums & np.uint64(0xFFFF)).astype(np.uint16)
+
+
+class NearDuplicateIndex:
+    """Bounded LSH index from MinHash signatures to verdict cache keys."""
+
+    def __init__(self, max_entries: int = 100000, threshold: float = 0.7,
+                 num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands or (num_perm // bands) * 16 > 64:
+            raise ValueError("Each band must be at most 4 signature values")
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Direct-mapped band tables at least twice the entry count, power of two sized
+        self._table_bits = max(4, int(2 * max_entries - 1).bit_length())
+        self._shift = np.uint64(64 - self._table_bits)
+        self._tables = np.zeros((bands, 1 << self._table_bits), dtype=np.int32)
+        self._signatures = np.zeros((max_entries, num_perm), dtype=np.uint16)
+        self._keys = np.zeros((max_entries, 32), dtype=np.uint8)
+        self._next = 0
+        self._band_rows = np.arange(bands)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self._next, self.max_entries)
+
+    def _buckets(self, signatures: np.ndarray) -> np.ndarray:
+        """Table index of every band of one or more signatures."""
+        padded = np.zeros(signatures.shape[:-1] + (self.bands, 4), dtype=np.uint16)
+        padded[..., :self.rows] = signatures.reshape(signatures.shape[:-1] + (self.bands, self.rows))
+        band_keys = padded.view(np.uint64)[..., 0]
+        return ((band_keys * _GOLDEN) >> self._shift).astype(np.intp)
+
+    def add(self, key: str, sig: np.ndarray) -> None:
+        """Store a signature under a hex content key (see verdict_cache.content_key)."""
+        with self._lock:
+            slot = self._next % self.max_entries
+            self._next += 1
+            self._signatures[slot] = sig
+            self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+            self._tables[self._band_rows, self._buckets(sig)] = slot + 1
+
+    def add_many(self, keys: np.ndarray, signatures: np.ndarray) -> None:
+        """Bulk insert: keys is an (n, 32) uint8 array of content key bytes."""
+        with self._lock:
+            slots = (self._next + np.arange(len(keys))) % self.max_entries
+            self._next += len(keys)
+            self._signatures[slots] = signatures
+            self._keys[slots] = keys
+            buckets = self._buckets(signatures)
+            for band in range(self.bands):
+                self._tables[band, buckets[:, band]] = slots + 1
+
+    def query(self, sig: np.ndarray) -> Optional[Tuple[str, float]]:
+        """Return (content key, estimated similarity) of the closest stored article."""
+        with self._lock:
+            candidates = self._tables[self._band_rows, self._buckets(sig)]
+            candidates = np.unique(candidates[candidates > 0]) - 1
+            match = None
+            if len(candidates):
+                similarity = (self._signatures[candidates] == sig).mean(axis=1)
+                best = int(similarity.argmax())
+                if similarity[best] >= self.threshold:
+                    match = (self._keys[candidates[best]].tobytes().hex(), float(similarity[best]))
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return match
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_bytes": self._tables.nbytes + self._signatures.nbytes + self._keys.nbytes
+        }
@@ -0,0 +1,177 @@
+"""Cross-reference search: several keyword queries against the news RSS feed.
+
+Queries are derived from the article: its opening words (the old single
+query) plus groups of its highest-weighted TF-IDF terms from the trained
+vectorizer, or its most frequent content words when no model is available.
+Feeds for all queries are fetched concurrently, each with its own timeout,
+parsed incrementally as they download (reading stops once enough items
+have arrived), cached per query for NEWS_SEARCH_CACHE_TTL seconds, and
+merged round-robin with duplicate links and titles removed.
+"""
+import asyncio
+import collections
+import os
+import re
+from typing import List, Optional
+from xml.etree import ElementTree
+
+import httpx
+
+from metrics import record_upstream_error
+from url_cache import canonicalize_url
+from ttl_cache import TTLCache
+
+NEWS_SEARCH_QUERIES = int(os.getenv("NEWS_SEARCH_QUERIES", "3"))
+NEWS_SEARCH_TIMEOUT = float(os.getenv("NEWS_SEARCH_TIMEOUT", "5"))
+NEWS_SEARCH_CACHE_TTL = float(os.getenv("NEWS_SEARCH_CACHE_TTL", "600"))
+NEWS_SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("NEWS_SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+LEAD_QUERY_WORDS = 10
+TERMS_PER_QUERY = 4
+# Only the start of long documents is used to pick query terms
+MAX_QUERY_SOURCE_CHARS = 20000
+# Feeds larger than this are cut off
+MAX_FEED_BYTES = 2 * 1024 * 1024
+
+_WORD = re.compile(r"(?u)\b[^\W\d_]{3,}\b")
+# Used only when no trained vectorizer (with its own stop words) is available
+_STOP_WORDS = frozenset("""
+about after again also been before being between both could does doing down during each
+from further have having here into just more most other over same should some such than
+that their them then there these they this those through under until very were what when
+where which while will with would your said says the and for are was but not you his her
+has had its our out who how all any can one two new
+""".split())
+
+
+def _load_scorer(model_dir: str):
+    """The (per-process, cached) NumPy scorer for model_dir, or None if it cannot be loaded."""
+    from ml_inference import load_scorer
+
+    try:
+        return load_scorer(model_dir, "numpy")
+    except (OSError, ValueError):
+        return None
+
+
+def top_terms(text: str, count: int, model_dir: Optional[str] = None) -> List[str]:
+    """The article's most distinctive terms, best first."""
+    scorer = _load_scorer(model_dir) if model_dir else None
+    if scorer is not None:
+        columns, values = scorer.transform_one(text)
+        best = sorted(zip(values.tolist(), columns.tolist()), reverse=True)[:count]
+        return scorer.terms([column for _, column in best])
+
+    counts = collections.Counter(
+        word for word in _WORD.findall(text.lower()) if word not in _STOP_WORDS
+    )
+    return [word for word, _ in counts.most_common(count)]
+
+
+def derive_queries(model_dir: Optional[str], text: str,
+                   max_queries: int = NEWS_SEARCH_QUERIES) -> List[str]:
+    """Search queries for an article; safe to send to pool workers."""
+    text = text[:MAX_QUERY_SOURCE_CHARS]
+    queries = []
+    lead = " ".join(text.split()[:LEAD_QUERY_WORDS])
+    if lead:
+        queries.append(lead)
+    terms = top_terms(text, max(0, max_queries - 1) * TERMS_PER_QUERY, model_dir)
+    for start in range(0, len(terms), TERMS_PER_QUERY):
+        if len(queries) >= max_queries:
+            break
+        queries.append(" ".join(terms[start:start + TERMS_PER_QUERY]))
+    return queries
+
+
+async def parse_feed_items(response: httpx.Response, max_items: int,
+                           max_bytes: int = MAX_FEED_BYTES) -> List[dict]:
+    """Parse RSS <item>s from a streamed response, stopping after max_items."""
+    parser = ElementTree.XMLPullParser(events=("end",))
+    items = []
+    received = 0
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag != "item":
+                continue
+            title = (element.findtext("title") or "").strip()
+            link = (element.findtext("link") or "").strip()
+            if title and link:
+                item = {"title": title, "link": link, "snippet": title}
+                source = (element.findtext("source") or "").strip()
+                if source:
+                    item["source"] = source
+                items.append(item)
+            element.clear()
+            if len(items) >= max_items:
+                return items
+        if received >= max_bytes:
+            break
+    return items
+
+
+def merge_results(result_lists: List[List[dict]], max_results: int) -> List[dict]:
+    """Interleave results from each query, dropping repeated links and titles."""
+    merged = []
+    seen = set()
+    for rank in range(max((len(results) for results in result_lists), default=0)):
+        for results in result_lists:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+            keys = (canonicalize_url(item["link"]), " ".join(item["title"].casefold().split()))
+            if keys[0] in seen or keys[1] in seen:
+                continue
+            seen.update(keys)
+            merged.append(item)
+            if len(merged) >= max_results:
+                return merged
+    return merged
+
+
+class NewsSearch:
+    """Concurrent, cached RSS searches for a list of queries."""
+
+    def __init__(self, search_url: str, timeout: float = NEWS_SEARCH_TIMEOUT,
+                 max_results: int = 5, ttl_seconds: float = NEWS_SEARCH_CACHE_TTL,
+                 max_entries: int = NEWS_SEARCH_CACHE_MAX_ENTRIES):
+        self.search_url = search_url
+        self.timeout = timeout
+        self.max_results = max_results
+        # Query -> feed items; the cached lists are shared, not copied
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def _fetch(self, client: httpx.AsyncClient, query: str) -> List[dict]:
+        params = {'q': query, 'hl': 'en-US', 'gl': 'US', 'ceid': 'US:en'}
+        async with client.stream("GET", self.search_url, params=params, timeout=self.timeout) as response:
+            response.raise_for_status()
+            return await parse_feed_items(response, self.max_results)
+
+    async def _search_one(self, client: httpx.AsyncClient, query: str) -> List[dict]:
+        key = " ".join(query.casefold().split())
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            # Bounds the whole request, including a feed that trickles in slowly
+            items = await asyncio.wait_for(self._fetch(client, query), self.timeout)
+        except httpx.HTTPStatusError as e:
+            record_upstream_error("news_search", f"http_{e.response.status_code}")
+            print(f"News search failed with status {e.response.status_code}")
+            return []
+        except Exception as e:
+            # Failures are not cached, so the next request tries again
+            record_upstream_error("news_search", type(e).__name__)
+            print(f"Search error for '{query}': {str(e) or type(e).__name__}")
+            return []
+        self.cache.set(key, items)
+        return items
+
+    async def search(self, client: httpx.AsyncClient, queries: List[str]) -> List[dict]:
+        result_lists = await asyncio.gather(*(self._search_one(client, q) for q in queries))
+        return merge_results(list(result_lists), self.max_results)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
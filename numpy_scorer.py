@@ -0,0 +1,229 @@
+"""NumPy-only reimplementation of the TF-IDF + Logistic Regression pipeline.
+
+Scoring an article is tokenize -> vocabulary lookup and counts -> IDF
+scaling -> L2 normalization -> dot with the coefficients -> sigmoid. Doing
+that directly avoids importing scikit-learn at request time and skips the
+sparse-matrix machinery for single articles. Built from the compact artifact
+it needs only NumPy; built from the joblib models it reproduces
+``clf.predict_proba(vectorizer.transform(texts))``, which can be checked with:
+
+    python numpy_scorer.py verify --model-dir Model
+"""
+import argparse
+import re
+import unicodedata
+from typing import List
+
+import numpy as np
+
+
+def _strip_accents_unicode(text: str) -> str:
+    normalized = unicodedata.normalize("NFKD", text)
+    if normalized == text:
+        return text
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _strip_accents_ascii(text: str) -> str:
+    return unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+
+
+class NumpyScorer:
+    """Score articles with plain arrays instead of sklearn estimators."""
+
+    def __init__(self, vocabulary: dict, idf, coef, intercept, classes,
+                 lowercase: bool = True, token_pattern: str = r"(?u)\b\w\w+\b",
+                 ngram_range=(1, 1), norm: str = "l2", use_idf: bool = True,
+                 sublinear_tf: bool = False, binary: bool = False,
+                 strip_accents: str = None, stop_words=None, term_lookup=None):
+        if norm not in ("l1", "l2", None):
+            raise ValueError(f"Unsupported norm: {norm}")
+        self.vocabulary = vocabulary
+        # column list -> terms; built from the vocabulary on first use if not given
+        self._term_lookup = term_lookup
+        self.idf = idf if use_idf else None
+        # coef/intercept may be float32 memory maps; they are upcast per row
+        self.coef = np.atleast_2d(coef)
+        self.intercept = np.atleast_1d(intercept)
+        self.classes = np.asarray(classes)
+        self.lowercase = lowercase
+        self.token_re = re.compile(token_pattern)
+        self.min_n, self.max_n = ngram_range
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.strip_accents = {
+            None: None,
+            "unicode": _strip_accents_unicode,
+            "ascii": _strip_accents_ascii
+        }[strip_accents]
+
+    @classmethod
+    def from_sklearn(cls, vectorizer, clf) -> "NumpyScorer":
+        """Build a scorer from a fitted TfidfVectorizer and linear classifier."""
+        if vectorizer.analyzer != "word" or vectorizer.tokenizer or vectorizer.preprocessor:
+            raise ValueError("Only word analyzers with the default tokenizer are supported")
+        return cls(
+            vectorizer.vocabulary_, vectorizer.idf_ if vectorizer.use_idf else None,
+            clf.coef_, clf.intercept_, clf.classes_,
+            lowercase=vectorizer.lowercase, token_pattern=vectorizer.token_pattern,
+            ngram_range=vectorizer.ngram_range, norm=vectorizer.norm,
+            use_idf=vectorizer.use_idf, sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary, strip_accents=vectorizer.strip_accents,
+            stop_words=vectorizer.get_stop_words()
+        )
+
+    @classmethod
+    def from_artifact(cls, model) -> "NumpyScorer":
+        """Build a scorer from a model_artifact.CompactModel without sklearn."""
+        params = model.vectorizer_params
+        # IDF smoothing only affects fitting; the stored weights already include it
+        params.pop("smooth_idf", None)
+        return cls(
+            model.vocabulary(), model.arrays["idf"], model.arrays["coef"],
+            model.arrays["intercept"], model.classes,
+            stop_words=model.header["stop_words"], term_lookup=model.terms_for_columns, **params
+        )
+
+    def terms(self, columns) -> List[str]:
+        """Vocabulary terms of the given feature columns."""
+        if self._term_lookup is None:
+            by_column = [None] * len(self.vocabulary)
+            for term, column in self.vocabulary.items():
+                by_column[column] = term
+            self._term_lookup = lambda wanted: [by_column[c] for c in wanted]
+        return self._term_lookup(columns)
+
+    def _ngrams(self, tokens: list):
+        for n in range(self.min_n, self.max_n + 1):
+            if n == 1:
+                yield from tokens
+            else:
+                yield from map(" ".join, zip(*(tokens[i:] for i in range(n))))
+
+    def transform_one(self, text: str):
+        """Return the sorted feature columns and TF-IDF values for one article."""
+        if self.lowercase:
+            text = text.lower()
+        if self.strip_accents:
+            text = self.strip_accents(text)
+        tokens = self.token_re.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        counts = {}
+        vocabulary = self.vocabulary
+        for gram in self._ngrams(tokens):
+            column = vocabulary.get(gram)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+
+        columns = np.fromiter(sorted(counts), dtype=np.intp, count=len(counts))
+        values = np.fromiter((counts[c] for c in columns), dtype=np.float64, count=len(counts))
+        if self.binary:
+            values[:] = 1.0
+        elif self.sublinear_tf:
+            values = np.log(values) + 1.0
+        if self.idf is not None:
+            values *= self.idf[columns]
+        if self.norm == "l2":
+            norm = np.sqrt(np.dot(values, values))
+        elif self.norm == "l1":
+            norm = np.abs(values).sum()
+        else:
+            norm = 0.0
+        if norm > 0:
+            values /= norm
+        return columns, values
+
+    def decision_function(self, texts: List[str]) -> np.ndarray:
+        scores = np.empty((len(texts), self.coef.shape[0]), dtype=np.float64)
+        for i, text in enumerate(texts):
+            columns, values = self.transform_one(text)
+            scores[i] = self.coef[:, columns] @ values
+        scores += self.intercept
+        return scores
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def score(self, texts: List[str]) -> List[dict]:
+        """Same output as ml_inference.score_texts."""
+        proba = self.predict_proba(texts)
+        best = proba.argmax(axis=1)
+        labels = self.classes[best]
+        return [
+            {
+                "prediction": "Real" if label == 1 else "Fake",
+                "confidence": float(proba[i, best[i]])
+            }
+            for i, label in enumerate(labels)
+        ]
+
+
+def verify_against_sklearn(vectorizer, clf, texts: List[str]) -> float:
+    """Return the largest probability difference between both pipelines."""
+    expected = clf.predict_proba(vectorizer.transform(texts))
+    actual = NumpyScorer.from_sklearn(vectorizer, clf).predict_proba(texts)
+    return float(np.abs(expected - actual).max())
+
+
+def _sample_texts(path: str, limit: int) -> List[str]:
+    from batch_score import _detect_format, _record_text, read_records
+
+    texts = []
+    for record in read_records(path, _detect_format(path)):
+        texts.append(_record_text(record))
+        if len(texts) >= limit:
+            break
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the NumPy scorer against the sklearn models.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    verify = subparsers.add_parser("verify")
+    verify.add_argument("--model-dir", default="Model")
+    verify.add_argument("--texts", help="CSV/JSONL file of articles (default: synthetic articles)")
+    verify.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    import random
+    import time
+
+    from ml_inference import load_joblib_models
+
+    vectorizer, clf = load_joblib_models(args.model_dir)
+    if args.texts:
+        texts = _sample_texts(args.texts, args.limit)
+    else:
+        rng = random.Random(0)
+        words = [term for term in vectorizer.vocabulary_ if " " not in term]
+        texts = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(20, 800)))
+            for _ in range(args.limit)
+        ]
+
+    print(f"Max probability difference over {len(texts)} articles: "
+          f"{verify_against_sklearn(vectorizer, clf, texts):.3e}")
+
+    scorer = NumpyScorer.from_sklearn(vectorizer, clf)
+    for name, fn in (("sklearn", lambda t: clf.predict_proba(vectorizer.transform(t))),
+                     ("numpy", scorer.predict_proba)):
+        start = time.perf_counter()
+        for text in texts:
+            fn([text])
+        per_article = (time.perf_counter() - start) / len(texts) * 1000
+        print(f"{name:>8}: {per_article:.3f} ms per article")
+
+
+if __name__ == "__main__":
+    main()
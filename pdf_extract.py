@@ -0,0 +1,148 @@
+"""PDF text extraction with an early cutoff and page-parallel mode.
+
+Pages are extracted in order and collected into a list that is joined once,
+and extraction stops as soon as ``char_budget`` characters are available,
+since neither the classifier nor the verification prompt needs the rest of a
+300-page document. ``extract_pdf_text_in_pool`` splits large documents into
+page ranges and runs each range as a separate task in the CPU pool, so a
+long PDF uses several workers. PyPDF2 is imported on first use.
+"""
+import asyncio
+import io
+import os
+import tempfile
+from typing import Optional
+
+# Characters of PDF text needed for classification/verification (0 = no limit)
+PDF_CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "100000"))
+# Documents with at least this many pages are extracted in parallel (0 = never)
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))
+
+# Reader reused by a pool worker across page ranges of the same file
+_worker_reader = (None, None)
+
+
+def _page_text(page) -> str:
+    return page.extract_text() or ""
+
+
+def _extract_sequential(reader, char_budget: int) -> list:
+    parts = []
+    collected = 0
+    for page in reader.pages:
+        text = _page_text(page)
+        parts.append(text)
+        collected += len(text) + 1
+        if char_budget and collected >= char_budget:
+            break
+    return parts
+
+
+def _extract_page_range(path: str, start: int, stop: int, char_budget: int) -> list:
+    """Extract pages [start, stop) of the PDF at path inside a pool worker."""
+    from PyPDF2 import PdfReader
+
+    global _worker_reader
+    if _worker_reader[0] != path:
+        _worker_reader = (path, PdfReader(path))
+    reader = _worker_reader[1]
+
+    parts = []
+    collected = 0
+    for index in range(start, stop):
+        text = _page_text(reader.pages[index])
+        parts.append(text)
+        collected += len(text) + 1
+        if char_budget and collected >= char_budget:
+            break
+    return parts
+
+
+def _extract_short(data: bytes, char_budget: int, parallel_min_pages: int):
+    """Pool task: (page count, text parts), with parts None for a document to split."""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if parallel_min_pages and page_count >= parallel_min_pages:
+        return page_count, None
+    return page_count, _extract_sequential(reader, char_budget)
+
+
+def _write_temp_pdf(data: bytes) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+        return f.name
+
+
+async def _extract_ranges(pool, path: str, page_count: int, char_budget: int, workers: int) -> list:
+    range_size = max(1, -(-page_count // (workers * 4)))
+    ranges = [(start, min(start + range_size, page_count))
+              for start in range(0, page_count, range_size)]
+
+    parts = []
+    collected = 0
+    pending = []
+    next_range = 0
+    try:
+        while next_range < len(ranges) or pending:
+            # Keep a bounded window of ranges in flight, consumed in page order.
+            # The document was already admitted, so its ranges wait for workers
+            # instead of being rejected halfway through
+            while next_range < len(ranges) and len(pending) < workers * 2:
+                start, stop = ranges[next_range]
+                pending.append(asyncio.ensure_future(pool.run(
+                    _extract_page_range, path, start, stop, char_budget, reject_when_busy=False
+                )))
+                next_range += 1
+
+            range_parts = await pending.pop(0)
+            parts.extend(range_parts)
+            collected += sum(len(text) + 1 for text in range_parts)
+            if char_budget and collected >= char_budget:
+                break
+        return parts
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def extract_pdf_text(data: bytes, char_budget: Optional[int] = None) -> str:
+    """Extract up to char_budget characters of text from a PDF, page by page.
+
+    ``char_budget`` defaults to PDF_CHAR_BUDGET.
+    """
+    from PyPDF2 import PdfReader
+
+    if char_budget is None:
+        char_budget = PDF_CHAR_BUDGET
+
+    parts = _extract_sequential(PdfReader(io.BytesIO(data)), char_budget)
+    text = "\n".join(parts)
+    return text[:char_budget] if char_budget else text
+
+
+async def extract_pdf_text_in_pool(data: bytes, pool, char_budget: Optional[int] = None) -> str:
+    """extract_pdf_text() run in ``pool`` (a cpu_pool.CpuPool).
+
+    Documents shorter than PDF_PARALLEL_MIN_PAGES, or any document when the
+    pool has a single worker, are extracted by one task; longer ones are written to a temporary file that the workers open
+    themselves, and their page ranges are extracted by concurrent tasks.
+    """
+    if char_budget is None:
+        char_budget = PDF_CHAR_BUDGET
+    # Thread-mode pools (max_workers=0) would share one cached reader
+    workers = pool.max_workers
+    parallel_min_pages = PDF_PARALLEL_MIN_PAGES if workers > 1 else 0
+
+    page_count, parts = await pool.run(_extract_short, data, char_budget, parallel_min_pages)
+    if parts is None:
+        path = await asyncio.to_thread(_write_temp_pdf, data)
+        try:
+            parts = await _extract_ranges(pool, path, page_count, char_budget, workers)
+        finally:
+            os.unlink(path)
+
+    text = "\n".join(parts)
+    return text[:char_budget] if char_budget else text
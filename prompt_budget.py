@@ -0,0 +1,162 @@
+"""Fit article text into a token budget before it goes into an LLM prompt.
+
+Articles that fit are passed through unchanged. Longer ones are condensed to
+their most informative sentences: each sentence is scored by the TF-IDF
+weight (in the whole article) of the terms it contains, per token, and the
+best sentences are kept in their original order until the budget is spent.
+The opening sentences, which usually state the main claims, are always kept.
+Term weights come from the trained vectorizer when a model is available and
+from the article's own sentences otherwise.
+"""
+import math
+import os
+import re
+from typing import List, Optional, Tuple
+
+# Article tokens allowed in the prompt; 0 disables condensation
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))
+# Hard cap on article characters for callers that pass it when condensation is disabled
+PROMPT_FALLBACK_MAX_CHARS = int(os.getenv("PROMPT_FALLBACK_MAX_CHARS", "3000"))
+# Sentences from the start of the article that are always kept
+LEAD_SENTENCES = 3
+# Rough characters per token for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+# Longer "sentences" (OCR output, text without punctuation) are split into pieces
+MAX_SENTENCE_WORDS = 60
+# Marks where sentences were left out
+GAP = "[...]"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])|\n\s*\n")
+_WORD = re.compile(r"(?u)\b\w\w+\b")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[str]:
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = (sentence or "").split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[start:start + MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+def _article_weights(sentences: List[str]) -> List[float]:
+    """Sentence scores with IDF computed over the article's own sentences."""
+    terms = [set(_WORD.findall(s.lower())) for s in sentences]
+    document_frequency = {}
+    term_frequency = {}
+    for sentence_terms, sentence in zip(terms, sentences):
+        for term in sentence_terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+        for term in _WORD.findall(sentence.lower()):
+            term_frequency[term] = term_frequency.get(term, 0) + 1
+    n = len(sentences)
+    weight = {
+        term: count * (math.log((1 + n) / (1 + document_frequency[term])) + 1)
+        for term, count in term_frequency.items()
+    }
+    return [sum(weight[t] for t in sentence_terms) for sentence_terms in terms]
+
+
+def _model_weights(sentences: List[str], text: str, scorer) -> List[float]:
+    """Sentence scores from the trained vectorizer's TF-IDF weights."""
+    columns, values = scorer.transform_one(text)
+    weight = dict(zip(columns.tolist(), values.tolist()))
+    return [
+        sum(weight.get(column, 0.0) for column in scorer.transform_one(sentence)[0].tolist())
+        for sentence in sentences
+    ]
+
+
+def condense(text: str, token_budget: int = PROMPT_TOKEN_BUDGET, scorer=None,
+             max_chars: int = 0) -> Tuple[str, dict]:
+    """Return (text within the budget, stats).
+
+    ``scorer`` is a numpy_scorer.NumpyScorer whose vocabulary and IDF weight
+    the terms; without one the article itself is used. When ``token_budget``
+    is 0 or less, the text is only cut to ``max_chars`` characters (0 = no
+    limit).
+    """
+    stats = {"original_tokens": estimate_tokens(text), "sentences_kept": None}
+    if token_budget <= 0:
+        if max_chars > 0:
+            text = text[:max_chars]
+        stats["tokens"] = estimate_tokens(text)
+        return text, stats
+    if stats["original_tokens"] <= token_budget:
+        stats["tokens"] = stats["original_tokens"]
+        return text, stats
+
+    sentences = split_sentences(text)
+    if scorer is not None:
+        scores = _model_weights(sentences, text, scorer)
+    else:
+        scores = _article_weights(sentences)
+
+    budget = token_budget
+    keep = set()
+    seen = set()
+    lead = range(min(LEAD_SENTENCES, len(sentences)))
+    # Best score per token first, so a few long sentences cannot use up the budget
+    rest = sorted(
+        range(LEAD_SENTENCES, len(sentences)),
+        key=lambda i: -scores[i] / max(1, estimate_tokens(sentences[i]))
+    )
+    for i in [*lead, *rest]:
+        # Repeated boilerplate (captions, page headers) is kept once
+        normalized = sentences[i].casefold()
+        cost = estimate_tokens(sentences[i]) + 1
+        if cost <= budget and normalized not in seen:
+            keep.add(i)
+            seen.add(normalized)
+            budget -= cost
+
+    parts = []
+    previous = -1
+    for i in sorted(keep):
+        if parts and i != previous + 1:
+            parts.append(GAP)
+        parts.append(sentences[i])
+        previous = i
+    if previous != len(sentences) - 1:
+        parts.append(GAP)
+    condensed = " ".join(parts)
+
+    stats["tokens"] = estimate_tokens(condensed)
+    stats["sentences_kept"] = f"{len(keep)}/{len(sentences)}"
+    return condensed, stats
+
+
+def condense_with_model(model_dir: Optional[str], text: str,
+                        token_budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[str, dict]:
+    """condense() using the trained vectorizer in model_dir if it can be loaded.
+
+    Safe to send to pool workers, which reuse their cached scorer.
+    """
+    scorer = None
+    if model_dir and estimate_tokens(text) > token_budget > 0:
+        from ml_inference import load_scorer
+
+        try:
+            scorer = load_scorer(model_dir, "numpy")
+        except (OSError, ValueError):
+            pass
+    return condense(text, token_budget, scorer)
+
+
+def format_search_results(results: List[dict], max_title_chars: int = 150) -> str:
+    """One line per search result instead of indented JSON."""
+    lines = []
+    for item in results:
+        title = " ".join((item.get("title") or "").split())[:max_title_chars]
+        line = f"- {title} ({item.get('link', '')})"
+        if item.get("source"):
+            line += f" [{item['source']}]"
+        snippet = " ".join((item.get("snippet") or "").split())
+        if snippet and snippet != title:
+            line += f": {snippet[:max_title_chars]}"
+        lines.append(line)
+    return "\n".join(lines) or "(no related articles found)"
@@ -0,0 +1,87 @@
+"""Server-sent events for /api/verify/stream.
+
+The report is streamed as it is generated:
+
+    event: meta        {"tier": "llm", "cached": false, "ml": {...}}
+    event: verdict     {"verdict": "REAL", "confidence": 85}   (sent as each is parsed)
+    event: chunk       {"text": "..."}                         (report text so far, appended)
+    event: done        {"verification": "...", "tier": ..., "cached": ...}
+    event: error       {"detail": "..."}
+
+The verdict event is sent as soon as the VERDICT line is complete and again
+once CONFIDENCE is known, so the client can show the outcome long before
+the rest of the report arrives.
+"""
+import asyncio
+import json
+import re
+import threading
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+_VERDICT = re.compile(r"VERDICT:\W*(REAL|FAKE|UNVERIFIED)\b", re.IGNORECASE)
+_CONFIDENCE = re.compile(r"CONFIDENCE:\W*(\d{1,3})(?:\.\d+)?\s*%")
+
+_DONE = object()
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class VerdictParser:
+    """Pick the verdict and confidence out of a report as it streams in."""
+
+    def __init__(self):
+        self.text = ""
+        self.verdict: Optional[str] = None
+        self.confidence: Optional[int] = None
+
+    def feed(self, chunk: str) -> Optional[dict]:
+        """Add report text; return the summary when it has changed."""
+        self.text += chunk
+        changed = False
+        if self.verdict is None:
+            match = _VERDICT.search(self.text)
+            if match:
+                self.verdict = match.group(1).upper()
+                changed = True
+        if self.confidence is None:
+            match = _CONFIDENCE.search(self.text)
+            if match:
+                self.confidence = min(100, int(match.group(1)))
+                changed = True
+        if changed:
+            return {"verdict": self.verdict, "confidence": self.confidence}
+        return None
+
+
+async def iterate_in_thread(make_iterator: Callable[[], Iterator]) -> AsyncIterator:
+    """Consume a blocking iterator in a thread, yielding its items on the event loop."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in make_iterator():
+                if stopped.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # The client went away or the consumer stopped early
+        stopped.set()
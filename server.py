@@ -1,19 +1,8 @@
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 import os
 
-class Handler(SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory="frontend", **kwargs)
+from static_server import STATIC_PORT, run
 
-    def end_headers(self):
-        self.send_header('Access-Control-Allow-Origin', '*')
-        super().end_headers()
-
-def run(port=3000):
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, Handler)
-    print(f'Starting server on port {port}...')
-    httpd.serve_forever()
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
 
 if __name__ == '__main__':
-    run() 
\ No newline at end of file
+    run(FRONTEND_DIR, STATIC_PORT)
@@ -0,0 +1,146 @@
+"""Lazy initialization of heavy dependencies and a startup timing report.
+
+Workers are started and stopped constantly by the autoscaler, so the API
+servers import only what they need to answer health checks and defer the
+Gemini client, OCR/PDF libraries and ML models to LazyResource objects. They
+are loaded on first use or by the warm-up hook (WARMUP env var):
+
+    none        load everything on first use
+    background  start loading in a thread at startup (default); /api/ready
+                returns 503 until every resource is loaded
+    blocking    load everything before the server accepts connections
+"""
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+WARMUP = os.getenv("WARMUP", "background")
+
+
+class StartupReport:
+    """Durations of the named import/load phases of this process."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = time.perf_counter() - start
+
+    def mark_ready(self) -> None:
+        if self.ready_after is None:
+            self.ready_after = time.perf_counter() - self.started
+            self.log()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            phases = {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+        return {
+            "phases_ms": phases,
+            "ready_after_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+            "uptime_seconds": round(time.perf_counter() - self.started, 1)
+        }
+
+    def log(self) -> None:
+        snapshot = self.snapshot()
+        print("Startup timings:")
+        for name, ms in snapshot["phases_ms"].items():
+            print(f"  {name:<24} {ms:>8.1f} ms")
+        print(f"  {'ready after':<24} {snapshot['ready_after_ms']:>8.1f} ms")
+
+
+startup_report = StartupReport()
+
+
+class LazyResource:
+    """A value built on first use, at most once, from any thread."""
+
+    def __init__(self, name: str, loader: Callable[[], Any], report: StartupReport = startup_report):
+        self.name = name
+        self.loader = loader
+        self.report = report
+        self.error: Optional[str] = None
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self):
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    try:
+                        with self.report.phase(f"load {self.name}"):
+                            self._value = self.loader()
+                    except Exception as e:
+                        self.error = str(e)
+                        raise
+                    self.error = None
+                    self._loaded = True
+        return self._value
+
+    async def aget(self):
+        """Like get(), but loads in a thread so the event loop keeps serving."""
+        if self._loaded:
+            return self._value
+        return await asyncio.to_thread(self.get)
+
+    def status(self) -> dict:
+        status = {"loaded": self._loaded}
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+def _load_all(resources: Iterable[LazyResource], raise_errors: bool = False) -> None:
+    for resource in resources:
+        try:
+            resource.get()
+        except Exception as e:
+            print(f"Warm-up of {resource.name} failed: {e}")
+            if raise_errors:
+                raise
+    startup_report.mark_ready()
+
+
+async def warm_up(resources: Iterable[LazyResource], mode: str = WARMUP) -> None:
+    """Load resources according to the WARMUP mode; call from a startup event.
+
+    In blocking mode a failed load aborts startup.
+    """
+    resources = list(resources)
+    if mode == "blocking":
+        await asyncio.to_thread(_load_all, resources, True)
+    elif mode == "background":
+        threading.Thread(target=_load_all, args=(resources,), daemon=True,
+                         name="warm-up").start()
+    else:
+        startup_report.mark_ready()
+
+
+def readiness(resources: Iterable[LazyResource], mode: str = WARMUP):
+    """Return (ready, body) for a readiness endpoint."""
+    components = {resource.name: resource.status() for resource in resources}
+    # Without warm-up, resources load on first use and the server is ready at once
+    ready = mode not in ("background", "blocking") or all(
+        status["loaded"] for status in components.values()
+    )
+    return ready, {
+        "status": "ready" if ready else "starting",
+        "components": components,
+        "startup": startup_report.snapshot()
+    }
@@ -0,0 +1,203 @@
+"""In-memory static file server for the frontend.
+
+Every file under the served directory is read once at startup, along with
+precompressed gzip (and brotli, when the ``brotli`` package is installed)
+variants. Requests are answered from memory by a threaded server, with a
+content-hash ETag per variant and 304 responses to matching
+``If-None-Match`` headers.
+
+Local ``src``/``href`` references in HTML pages, relative or root-relative
+(``/app.js``), are rewritten to ``name?v=<content hash>``; requests
+carrying the current hash are cached by browsers for a year, everything
+else (including the pages themselves and unversioned URLs) is revalidated
+with the ETag on each use. Restart the server to pick up
+changed files.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+STATIC_PORT = int(os.getenv("STATIC_PORT", "3000"))
+# Smaller files are not worth compressing
+MIN_COMPRESS_BYTES = 256
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_COMPRESSIBLE = re.compile(r"^(text/|application/(javascript|json|xml)|image/svg\+xml)")
+_LOCAL_REFERENCE = re.compile(r"""\b(src|href)=(["'])([^"'?#:]+)\2""")
+
+
+class Asset:
+    """One file's body and its encoded variants, keyed by Content-Encoding."""
+
+    def __init__(self, body: bytes, content_type: str):
+        self.content_type = content_type
+        self.version = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES and _COMPRESSIBLE.match(content_type):
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+
+    def etag(self, encoding: str) -> str:
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.version}{suffix}"'
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(asset: Asset, accept_encoding: Optional[str]) -> str:
+    """Smallest variant the client accepts; identity when nothing else matches."""
+    accepted = _accepted_encodings(accept_encoding or "")
+    candidates = [
+        encoding for encoding in asset.variants
+        if encoding != "identity" and accepted.get(encoding, accepted.get("*", 0)) > 0
+    ]
+    if not candidates:
+        return "identity"
+    return min(candidates, key=lambda encoding: len(asset.variants[encoding]))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    # Weak comparison, as for GET/HEAD
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def load_site(directory: str) -> Dict[str, Asset]:
+    """Read every file under directory into memory, keyed by URL path."""
+    site = {}
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith((".", "__"))]
+        for name in files:
+            if name.startswith(".") or name.endswith((".py", ".pyc")):
+                continue
+            path = os.path.join(root, name)
+            url = "/" + os.path.relpath(path, directory).replace(os.sep, "/")
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type == "application/javascript":
+                content_type += "; charset=utf-8"
+            with open(path, "rb") as f:
+                site[url] = Asset(f.read(), content_type)
+
+    # Versioned references let browsers cache everything but the pages themselves
+    for url, asset in list(site.items()):
+        if not asset.content_type.startswith("text/html"):
+            continue
+        base = url.rsplit("/", 1)[0] + "/"
+
+        def versioned(match):
+            reference = match.group(3)
+            # Root-relative references ("/app.js") name a site key directly
+            path = reference if reference.startswith("/") else base + reference
+            target = site.get(posixpath.normpath(path))
+            if target is None:
+                return match.group(0)
+            attribute, quote, reference = match.groups()
+            return f"{attribute}={quote}{reference}?v={target.version}{quote}"
+
+        html = asset.variants["identity"].decode("utf-8")
+        site[url] = Asset(_LOCAL_REFERENCE.sub(versioned, html).encode("utf-8"), asset.content_type)
+    return site
+
+
+class StaticHandler(BaseHTTPRequestHandler):
+    """Serves the preloaded ``site`` of the server it is attached to."""
+
+    # Connections are kept open between asset requests
+    protocol_version = "HTTP/1.1"
+
+    def _resolve(self):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        if path.endswith("/"):
+            path += "index.html"
+        return self.server.site.get(path), parse_qs(parts.query).get("v", [None])[0]
+
+    def _send(self, include_body: bool):
+        asset, version = self._resolve()
+        if asset is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        encoding = choose_encoding(asset, self.headers.get("Accept-Encoding"))
+        etag = asset.etag(encoding)
+        cache_control = IMMUTABLE_CACHE_CONTROL if version == asset.version else REVALIDATE_CACHE_CONTROL
+        if _etag_matches(self.headers.get("If-None-Match", ""), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        body = asset.variants[encoding]
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(include_body=True)
+
+    def do_HEAD(self):
+        self._send(include_body=False)
+
+    def end_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        super().end_headers()
+
+
+class StaticServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, directory: str):
+        self.site = load_site(directory)
+        super().__init__(server_address, StaticHandler)
+
+
+def run(directory: str, port: int = STATIC_PORT):
+    httpd = StaticServer(("", port), directory)
+    total = sum(len(asset.variants["identity"]) for asset in httpd.site.values())
+    print(f"Loaded {len(httpd.site)} files ({total} bytes) from {directory}")
+    print(f"Starting server on port {port}...")
+    httpd.serve_forever()
@@ -0,0 +1,48 @@
+"""Regression tests for the streaming batch parser in ml_inference."""
+import asyncio
+
+import pytest
+
+from ml_inference import iter_json_records
+
+
+def parse(chunks):
+    """Run iter_json_records over chunks; returns (records, error message or None)."""
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        records = []
+        try:
+            async for record in iter_json_records(stream()):
+                records.append(record)
+        except ValueError as e:
+            return records, str(e)
+        return records, None
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_records():
+    assert parse([b'{"a": 1}\n{"b"', b': 2}\n"c"']) == ([{"a": 1}, {"b": 2}, "c"], None)
+
+
+def test_json_array_records():
+    assert parse([b'[{"a": 1}, {"b"', b': 2}]']) == ([{"a": 1}, {"b": 2}], None)
+
+
+@pytest.mark.parametrize("chunks", [
+    [b'{"a": 1}\n{bad}\n{"c": 3}\n'],
+    [b'{"a": 1}\n', b'{bad}\n{"c": 3}\n'],
+])
+def test_ndjson_valid_line_before_invalid_one_is_yielded(chunks):
+    records, error = parse(chunks)
+    assert records == [{"a": 1}]
+    assert error.startswith("Invalid JSON on line 2")
+
+
+def test_json_array_valid_element_before_invalid_one_is_yielded():
+    records, error = parse([b'[{"a": 1}, {bad}]'])
+    assert records == [{"a": 1}]
+    assert error is not None
@@ -1,16 +1,41 @@
+"""Train the TF-IDF + Logistic Regression fake news model on the CPU.
+
+The default mode loads True.csv and Fake.csv into pandas and fits on a
+sample. ``--streaming`` trains on the full dataset (or corpora larger than
+RAM) out of core:
+
+    python train_fake_news_model_cpu.py --streaming --workers 4 --epochs 2
+
+Streaming mode reads the CSVs in chunks and makes one pass to count document
+frequencies and pick the vocabulary, then trains an SGD logistic regression
+with ``partial_fit`` chunk by chunk. Featurization runs in a process pool.
+Held-out rows are chosen by a hash of the article text, so the split needs no
+shuffle in memory and duplicate articles never straddle train and test.
+"""
+import argparse
+import collections
+import os
+import resource
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 import joblib
-import os
 
-def load_data(sample_size=0.1):
+# Document frequency candidates kept while counting the vocabulary pass
+MAX_VOCAB_CANDIDATES = 2_000_000
+
+def load_data(sample_size=0.1, data_dir='.'):
     """Load and preprocess the fake news dataset."""
     # Load true and fake news datasets
-    true_df = pd.read_csv('True.csv')
-    fake_df = pd.read_csv('Fake.csv')
+    true_df = pd.read_csv(os.path.join(data_dir, 'True.csv'))
+    fake_df = pd.read_csv(os.path.join(data_dir, 'Fake.csv'))
     
     # Add labels
     true_df['label'] = 1  # 1 for true news
@@ -25,10 +50,10 @@ def load_data(sample_size=0.1):
     
     return df
 
-def train_model(X_train, y_train, X_test, y_test):
+def train_model(X_train, y_train, X_test, y_test, max_features=5000):
     """Train the model and evaluate its performance."""
     # Create and train TF-IDF vectorizer
-    vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
+    vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
     X_train_tfidf = vectorizer.fit_transform(X_train)
     X_test_tfidf = vectorizer.transform(X_test)
     
@@ -45,34 +70,237 @@ def train_model(X_train, y_train, X_test, y_test):
     
     return vectorizer, clf
 
+def count_rows(path):
+    """Number of articles in a CSV, read in chunks."""
+    return sum(len(part) for part in pd.read_csv(path, usecols=['text'], chunksize=100000))
+
+def iter_labeled_chunks(data_dir, chunk_size, test_size, row_counts):
+    """Yield (texts, labels, is_test) chunks mixing rows from True.csv and Fake.csv.
+
+    ``row_counts`` is the number of rows in (True.csv, Fake.csv). Rows are
+    drawn from each file in proportion to its size, so both files run out
+    together and every partial_fit update sees both classes in the dataset's
+    ratio.
+    """
+    files = (('True.csv', 1), ('Fake.csv', 0))
+    readers = [
+        pd.read_csv(os.path.join(data_dir, name), usecols=['text'], chunksize=chunk_size)
+        for name, _ in files
+    ]
+    total = sum(row_counts)
+    taken = [0] * len(files)
+    emitted = 0
+    threshold = int(test_size * 1000)
+    while emitted < total:
+        emitted = min(total, emitted + chunk_size)
+        texts, labels = [], []
+        for i, (reader, (_, label)) in enumerate(zip(readers, files)):
+            # Rows this file owes so far to keep its share of the dataset
+            wanted = round(emitted * row_counts[i] / total) - taken[i]
+            if wanted <= 0:
+                continue
+            try:
+                part = reader.get_chunk(wanted)
+            except StopIteration:
+                continue
+            part_texts = part['text'].fillna('').astype(str).tolist()
+            taken[i] += len(part_texts)
+            texts.extend(part_texts)
+            labels.extend([label] * len(part_texts))
+        if texts:
+            is_test = np.fromiter(
+                (zlib.crc32(text.encode('utf-8')) % 1000 < threshold for text in texts),
+                dtype=bool, count=len(texts)
+            )
+            yield texts, np.array(labels), is_test
+
+# Vectorizer used by featurization workers (and by the parent when workers=1)
+_featurizer = None
+
+def _init_featurizer(vectorizer):
+    global _featurizer
+    _featurizer = vectorizer
+
+def _document_frequencies(texts):
+    analyze = _featurizer.build_analyzer()
+    counts = collections.Counter()
+    for text in texts:
+        counts.update(set(analyze(text)))
+    return counts
+
+def _transform(texts):
+    return _featurizer.transform(texts)
+
+def _map_chunks(fn, items, workers, vectorizer):
+    """Yield (item, fn(item texts)) in order, featurizing in a process pool.
+
+    Only a bounded number of chunks is in flight so reading cannot run ahead
+    of training.
+    """
+    if workers <= 1:
+        _init_featurizer(vectorizer)
+        for item in items:
+            yield item, fn(item[0])
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_featurizer,
+                             initargs=(vectorizer,)) as pool:
+        in_flight = collections.deque()
+        for item in items:
+            in_flight.append((item, pool.submit(fn, item[0])))
+            if len(in_flight) >= workers * 2:
+                item, future = in_flight.popleft()
+                yield item, future.result()
+        while in_flight:
+            item, future = in_flight.popleft()
+            yield item, future.result()
+
+def _select(chunks, split):
+    """Keep only the train (split=False) or test (split=True) rows of each chunk."""
+    for texts, labels, is_test in chunks:
+        keep = np.flatnonzero(is_test == split)
+        if len(keep):
+            yield [texts[i] for i in keep], labels[keep]
+
+def _report_pass(name, rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"{name}: {rows} rows in {elapsed:.1f}s ({rate:.0f} rows/second)")
+
+def build_vocabulary(args, base_vectorizer, row_counts):
+    """Count document frequencies over the training rows and fit the TF-IDF weights."""
+    start = time.perf_counter()
+    counts = collections.Counter()
+    n_docs = 0
+    chunks = _select(iter_labeled_chunks(args.data_dir, args.chunk_size, args.test_size, row_counts), False)
+    for (texts, _), chunk_counts in _map_chunks(_document_frequencies, chunks, args.workers, base_vectorizer):
+        counts.update(chunk_counts)
+        n_docs += len(texts)
+        # Bigrams make the candidate set grow with the corpus; drop the rare tail
+        if len(counts) > MAX_VOCAB_CANDIDATES:
+            counts = collections.Counter(dict(counts.most_common(MAX_VOCAB_CANDIDATES // 2)))
+    _report_pass("Vocabulary pass", n_docs, time.perf_counter() - start)
+    print(f"Vocabulary: {min(len(counts), args.max_features)} of {len(counts)} candidate terms")
+
+    # Ties are broken alphabetically so the vocabulary is deterministic
+    top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:args.max_features]
+    terms = sorted(term for term, _ in top)
+    document_frequency = np.array([counts[term] for term in terms], dtype=np.float64)
+
+    vectorizer = base_vectorizer
+    vectorizer.vocabulary_ = {term: column for column, term in enumerate(terms)}
+    # Same smoothed IDF as TfidfVectorizer.fit
+    vectorizer.idf_ = np.log((1 + n_docs) / (1 + document_frequency)) + 1
+    return vectorizer, n_docs
+
+def train_streaming(args):
+    """Out-of-core training; returns (vectorizer, clf, dataset rows)."""
+    base_vectorizer = TfidfVectorizer(
+        max_features=args.max_features, stop_words='english',
+        ngram_range=(1, args.ngram_max)
+    )
+    row_counts = [count_rows(os.path.join(args.data_dir, name)) for name in ('True.csv', 'Fake.csv')]
+    print(f"Dataset: {row_counts[0]} true and {row_counts[1]} fake articles")
+    vectorizer, _ = build_vocabulary(args, base_vectorizer, row_counts)
+
+    clf = SGDClassifier(loss='log_loss', alpha=args.alpha, random_state=42)
+    classes = np.array([0, 1])
+    rng = np.random.default_rng(42)
+    for epoch in range(1, args.epochs + 1):
+        start = time.perf_counter()
+        rows = scored = correct = 0
+        chunks = _select(iter_labeled_chunks(args.data_dir, args.chunk_size, args.test_size, row_counts), False)
+        for (_, labels), features in _map_chunks(_transform, chunks, args.workers, vectorizer):
+            order = rng.permutation(len(labels))
+            features, labels = features[order], labels[order]
+            # Progressive validation: score each chunk before learning from it
+            if rows:
+                correct += int((clf.predict(features) == labels).sum())
+                scored += len(labels)
+            clf.partial_fit(features, labels, classes=classes)
+            rows += len(labels)
+        _report_pass(f"Epoch {epoch}", rows, time.perf_counter() - start)
+        print(f"Progressive training accuracy: {correct / max(scored, 1):.4f}")
+
+    start = time.perf_counter()
+    rows = correct = 0
+    chunks = _select(iter_labeled_chunks(args.data_dir, args.chunk_size, args.test_size, row_counts), True)
+    for (_, labels), features in _map_chunks(_transform, chunks, args.workers, vectorizer):
+        correct += int((clf.predict(features) == labels).sum())
+        rows += len(labels)
+    _report_pass("Evaluation pass", rows, time.perf_counter() - start)
+    print(f"Testing accuracy: {correct / max(rows, 1):.4f}")
+    # Each pass reports its own rate above; the total counts every article once
+    return vectorizer, clf, sum(row_counts)
+
+def _peak_memory_mb():
+    # ru_maxrss is in kilobytes on Linux; children covers the featurization workers
+    parent = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return parent / scale, children / scale
+
 def main():
     """Main function to train and save the model."""
+    parser = argparse.ArgumentParser(description="Train the fake news TF-IDF + Logistic Regression model.")
+    parser.add_argument('--data-dir', default='.', help="Directory containing True.csv and Fake.csv")
+    parser.add_argument('--output-dir', default='models', help="Directory to write the joblib models to")
+    parser.add_argument('--sample-size', type=float, default=0.1, help="Fraction of rows to use (in-memory mode)")
+    parser.add_argument('--max-features', type=int, default=5000)
+    parser.add_argument('--streaming', action='store_true', help="Train out of core on the full dataset")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per chunk (streaming mode)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Featurization processes (streaming mode)")
+    parser.add_argument('--epochs', type=int, default=1, help="Passes over the training rows (streaming mode)")
+    parser.add_argument('--alpha', type=float, default=1e-6, help="SGD regularization strength (streaming mode)")
+    parser.add_argument('--ngram-max', type=int, default=1, help="Largest n-gram in the vocabulary (streaming mode)")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--compact', action='store_true', help="Also write the compact model artifact")
+    args = parser.parse_args()
+
     # Create models directory if it doesn't exist
-    os.makedirs('models', exist_ok=True)
-    
-    # Load and preprocess data
-    print("Loading data...")
-    df = load_data(sample_size=0.1)
-    
-    # Split features and target
-    X = df['text']
-    y = df['label']
-    
-    # Split into training and testing sets
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
-    
-    # Train model
-    print("Training model...")
-    vectorizer, clf = train_model(X_train, y_train, X_test, y_test)
-    
+    os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    if args.streaming:
+        print("Training model out of core...")
+        vectorizer, clf, rows_processed = train_streaming(args)
+    else:
+        # Load and preprocess data
+        print("Loading data...")
+        df = load_data(sample_size=args.sample_size, data_dir=args.data_dir)
+
+        # Split features and target
+        X = df['text']
+        y = df['label']
+
+        # Split into training and testing sets
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=args.test_size, random_state=42
+        )
+
+        # Train model
+        print("Training model...")
+        vectorizer, clf = train_model(X_train, y_train, X_test, y_test, args.max_features)
+        rows_processed = len(df)
+
     # Save model and vectorizer
     print("Saving model and vectorizer...")
-    joblib.dump(vectorizer, 'models/tfidf_vectorizer.joblib')
-    joblib.dump(clf, 'models/fake_news_model.joblib')
-    
-    print("Training complete! Model and vectorizer saved in 'models' directory.")
+    joblib.dump(vectorizer, os.path.join(args.output_dir, 'tfidf_vectorizer.joblib'))
+    joblib.dump(clf, os.path.join(args.output_dir, 'fake_news_model.joblib'))
+    if args.compact:
+        from model_artifact import ARTIFACT_NAME, export_artifact
+
+        export_artifact(vectorizer, clf, os.path.join(args.output_dir, ARTIFACT_NAME))
+
+    elapsed = time.perf_counter() - start
+    parent_mb, worker_mb = _peak_memory_mb()
+    print(f"Processed {rows_processed} rows in {elapsed:.1f}s "
+          f"({rows_processed / elapsed:.0f} rows/second)")
+    if args.streaming and args.workers > 1:
+        print(f"Peak memory: {parent_mb:.0f} MB (main process), {worker_mb:.0f} MB (largest worker)")
+    else:
+        print(f"Peak memory: {parent_mb:.0f} MB")
+    print(f"Training complete! Model and vectorizer saved in '{args.output_dir}' directory.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
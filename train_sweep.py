@@ -0,0 +1,344 @@
+"""Hyperparameter sweep over cached TF-IDF feature matrices.
+
+Three things are cached under TRAIN_CACHE_DIR (default .train_cache), keyed
+by a hash of the dataset files and the parameters that produced them:
+
+    split-*.joblib   train/test texts and labels
+    counts-*.joblib  n-gram count matrices for one analyzer (ngram range, stop words)
+    tfidf-*.joblib   TF-IDF matrices for one vectorizer (+ max_features, sublinear_tf)
+
+so rerunning a sweep, or adding classifier settings to it, never re-reads the
+CSVs or re-tokenizes the corpus. Candidates are fitted in a process pool and
+then measured one at a time for accuracy, training time, model size and
+single-article latency through the NumPy scorer used in production:
+
+    python train_sweep.py --data-dir archive --max-features 2000,5000,20000 \\
+        --ngram-max 1,2 --C 0.5,1,4 --results sweep.jsonl
+
+Candidates on the accuracy/latency frontier are marked with ``*``.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import normalize
+
+from model_artifact import ARTIFACT_NAME, export_artifact
+from numpy_scorer import NumpyScorer
+from train_fake_news_model_cpu import load_data
+
+TRAIN_CACHE_DIR = os.getenv("TRAIN_CACHE_DIR", ".train_cache")
+# Bump when the layout of cached files changes
+CACHE_VERSION = 1
+
+
+def _key(*parts) -> str:
+    blob = json.dumps([CACHE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_hash(data_dir: str) -> str:
+    """Hash the contents of True.csv and Fake.csv."""
+    digest = hashlib.sha256()
+    for name in ("True.csv", "Fake.csv"):
+        with open(os.path.join(data_dir, name), "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached(path: str, build):
+    """Load path if it exists, otherwise build, store and return the value."""
+    if os.path.exists(path):
+        return joblib.load(path)
+    value = build()
+    # Write to a temporary name first so an interrupted run leaves no partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(value, tmp_path)
+    os.replace(tmp_path, path)
+    return value
+
+
+def load_split(cache_dir: str, data_dir: str, sample_size: float, test_size: float):
+    """Return (key, split dict) with train/test texts and labels."""
+    key = _key("split", dataset_hash(data_dir), sample_size, test_size)
+
+    def build():
+        df = load_data(sample_size=sample_size, data_dir=data_dir)
+        X_train, X_test, y_train, y_test = train_test_split(
+            df["text"].fillna("").astype(str).tolist(), df["label"].to_numpy(),
+            test_size=test_size, random_state=42
+        )
+        return {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+
+    return key, _cached(os.path.join(cache_dir, f"split-{key}.joblib"), build)
+
+
+def count_path(cache_dir: str, split_key: str, analyzer: dict) -> str:
+    return os.path.join(cache_dir, f"counts-{_key('counts', split_key, analyzer)}.joblib")
+
+
+def build_counts(cache_dir: str, split_key: str, analyzer: dict) -> str:
+    """Tokenize the corpus once per analyzer setting into n-gram count matrices."""
+    path = count_path(cache_dir, split_key, analyzer)
+
+    def build():
+        split = joblib.load(os.path.join(cache_dir, f"split-{split_key}.joblib"))
+        counter = CountVectorizer(
+            stop_words=analyzer["stop_words"], ngram_range=(1, analyzer["ngram_max"])
+        )
+        train = counter.fit_transform(split["X_train"])
+        return {
+            "train": train,
+            "test": counter.transform(split["X_test"]),
+            "terms": counter.get_feature_names_out().tolist(),
+            "term_counts": np.asarray(train.sum(axis=0)).ravel(),
+            "document_frequency": np.bincount(train.indices, minlength=train.shape[1])
+        }
+
+    _cached(path, build)
+    return path
+
+
+def build_tfidf(cache_dir: str, split_key: str, analyzer: dict, vectorizer_params: dict) -> str:
+    """Derive TF-IDF matrices from the cached counts without re-tokenizing.
+
+    Follows TfidfVectorizer: the max_features most frequent terms (ties are
+    broken alphabetically), sublinear TF if requested, smoothed IDF and L2
+    normalization.
+    """
+    path = os.path.join(
+        cache_dir, f"tfidf-{_key('tfidf', split_key, analyzer, vectorizer_params)}.joblib"
+    )
+
+    def build():
+        counts = joblib.load(count_path(cache_dir, split_key, analyzer))
+        # Stable sort so ties keep alphabetical order, and columns stay sorted
+        order = np.argsort(-counts["term_counts"], kind="stable")[:vectorizer_params["max_features"]]
+        columns = np.sort(order)
+        n_docs = counts["train"].shape[0]
+        idf = np.log((1 + n_docs) / (1 + counts["document_frequency"][columns])) + 1
+
+        def weight(matrix):
+            matrix = matrix[:, columns].astype(np.float64)
+            if vectorizer_params["sublinear_tf"]:
+                np.log(matrix.data, out=matrix.data)
+                matrix.data += 1
+            return normalize(matrix.multiply(idf).tocsr())
+
+        return {
+            "train": weight(counts["train"]),
+            "test": weight(counts["test"]),
+            "terms": [counts["terms"][i] for i in columns],
+            "idf": idf
+        }
+
+    _cached(path, build)
+    return path
+
+
+def make_vectorizer(analyzer: dict, vectorizer_params: dict, tfidf: dict) -> TfidfVectorizer:
+    """Build the fitted TfidfVectorizer equivalent to a cached TF-IDF matrix."""
+    vectorizer = TfidfVectorizer(
+        stop_words=analyzer["stop_words"], ngram_range=(1, analyzer["ngram_max"]),
+        max_features=vectorizer_params["max_features"],
+        sublinear_tf=vectorizer_params["sublinear_tf"]
+    )
+    vectorizer.vocabulary_ = {term: column for column, term in enumerate(tfidf["terms"])}
+    vectorizer.idf_ = tfidf["idf"]
+    return vectorizer
+
+
+def make_classifier(name: str, C: float, n_samples: int):
+    if name == "sgd":
+        # Same objective as LogisticRegression(C) up to scaling of the loss
+        return SGDClassifier(loss="log_loss", alpha=1.0 / (C * n_samples), random_state=42)
+    return LogisticRegression(C=C, max_iter=1000)
+
+
+def fit_candidate(tfidf_path: str, y_train, y_test, classifier: str, C: float):
+    """Fit one classifier on cached features; runs in a pool worker."""
+    tfidf = joblib.load(tfidf_path)
+    clf = make_classifier(classifier, C, tfidf["train"].shape[0])
+    start = time.perf_counter()
+    clf.fit(tfidf["train"], y_train)
+    train_seconds = time.perf_counter() - start
+    return {
+        "clf": clf,
+        "train_seconds": train_seconds,
+        "train_accuracy": float(clf.score(tfidf["train"], y_train)),
+        "test_accuracy": float(clf.score(tfidf["test"], y_test))
+    }
+
+
+def measure_latency(scorer: NumpyScorer, texts, repeat: int = 1) -> dict:
+    """Single-article scoring latency in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            scorer.predict_proba([text])
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "latency_p50_ms": statistics.median(timings),
+        "latency_p95_ms": timings[int(len(timings) * 0.95) - 1]
+    }
+
+
+def model_size(vectorizer, clf) -> dict:
+    """Size of the joblib pickles and of the compact artifact, in bytes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        joblib.dump(vectorizer, os.path.join(tmp, "vectorizer.joblib"))
+        joblib.dump(clf, os.path.join(tmp, "clf.joblib"))
+        export_artifact(vectorizer, clf, os.path.join(tmp, ARTIFACT_NAME))
+        return {
+            "joblib_bytes": sum(
+                os.path.getsize(os.path.join(tmp, name))
+                for name in ("vectorizer.joblib", "clf.joblib")
+            ),
+            "artifact_bytes": os.path.getsize(os.path.join(tmp, ARTIFACT_NAME))
+        }
+
+
+def mark_frontier(results: list) -> None:
+    """Flag candidates no other candidate beats on both accuracy and p50 latency."""
+    for result in results:
+        result["on_frontier"] = not any(
+            other["test_accuracy"] >= result["test_accuracy"]
+            and other["latency_p50_ms"] <= result["latency_p50_ms"]
+            and (other["test_accuracy"] > result["test_accuracy"]
+                 or other["latency_p50_ms"] < result["latency_p50_ms"])
+            for other in results
+        )
+
+
+def _parse_list(value: str, kind):
+    if kind is bool:
+        return [item.strip().lower() in ("1", "true", "yes") for item in value.split(",")]
+    return [kind(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid search over cached TF-IDF features.")
+    parser.add_argument("--data-dir", default=".", help="Directory containing True.csv and Fake.csv")
+    parser.add_argument("--cache-dir", default=TRAIN_CACHE_DIR)
+    parser.add_argument("--sample-size", type=float, default=1.0)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--max-features", default="5000", help="Comma-separated values")
+    parser.add_argument("--ngram-max", default="1", help="Comma-separated values, e.g. 1,2")
+    parser.add_argument("--stop-words", default="english", help="english and/or none, comma-separated")
+    parser.add_argument("--sublinear-tf", default="false", help="Comma-separated true/false")
+    parser.add_argument("--classifier", default="logreg", help="logreg and/or sgd, comma-separated")
+    parser.add_argument("--C", default="1", help="Inverse regularization strengths, comma-separated")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--latency-samples", type=int, default=200,
+                        help="Test articles scored one at a time per candidate")
+    parser.add_argument("--results", help="Write one JSON line per candidate to this file")
+    parser.add_argument("--save-best", metavar="DIR",
+                        help="Save the most accurate frontier candidate within --max-latency-ms")
+    parser.add_argument("--max-latency-ms", type=float, help="Latency budget for --save-best")
+    args = parser.parse_args()
+
+    os.makedirs(args.cache_dir, exist_ok=True)
+    start = time.perf_counter()
+    split_key, split = load_split(args.cache_dir, args.data_dir, args.sample_size, args.test_size)
+    print(f"Dataset split {split_key}: {len(split['X_train'])} train / {len(split['X_test'])} test rows "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    analyzers = [
+        {"ngram_max": n, "stop_words": None if stop == "none" else stop}
+        for n, stop in itertools.product(_parse_list(args.ngram_max, int), args.stop_words.split(","))
+    ]
+    vectorizer_grid = [
+        {"max_features": m, "sublinear_tf": s}
+        for m, s in itertools.product(_parse_list(args.max_features, int),
+                                      _parse_list(args.sublinear_tf, bool))
+    ]
+    classifier_grid = list(itertools.product(args.classifier.split(","), _parse_list(args.C, float)))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        start = time.perf_counter()
+        list(pool.map(build_counts, itertools.repeat(args.cache_dir), itertools.repeat(split_key), analyzers))
+        features = list(itertools.product(analyzers, vectorizer_grid))
+        tfidf_paths = list(pool.map(
+            build_tfidf, itertools.repeat(args.cache_dir), itertools.repeat(split_key),
+            [a for a, _ in features], [v for _, v in features]
+        ))
+        print(f"Feature matrices ready ({time.perf_counter() - start:.1f}s)")
+
+        candidates = [
+            (analyzer, params, path, classifier, C)
+            for (analyzer, params), path in zip(features, tfidf_paths)
+            for classifier, C in classifier_grid
+        ]
+        futures = [
+            pool.submit(fit_candidate, path, split["y_train"], split["y_test"], classifier, C)
+            for _, _, path, classifier, C in candidates
+        ]
+        fitted = [future.result() for future in futures]
+
+    # Latency and size are measured serially so candidates do not compete for CPU
+    latency_texts = split["X_test"][:args.latency_samples]
+    results = []
+    models = []
+    for (analyzer, params, path, classifier, C), fit in zip(candidates, fitted):
+        vectorizer = make_vectorizer(analyzer, params, joblib.load(path))
+        clf = fit.pop("clf")
+        scorer = NumpyScorer.from_sklearn(vectorizer, clf)
+        results.append({
+            **analyzer, **params, "classifier": classifier, "C": C, **fit,
+            **model_size(vectorizer, clf), **measure_latency(scorer, latency_texts)
+        })
+        models.append((vectorizer, clf))
+    mark_frontier(results)
+
+    print(f"\n{'':1} {'ngram':>5} {'stop':>7} {'features':>8} {'sublin':>6} {'clf':>6} {'C':>6} "
+          f"{'test acc':>8} {'train s':>7} {'artifact':>9} {'p50 ms':>7} {'p95 ms':>7}")
+    for result in sorted(results, key=lambda r: -r["test_accuracy"]):
+        print(f"{'*' if result['on_frontier'] else ' '} {result['ngram_max']:>5} "
+              f"{str(result['stop_words']):>7} {result['max_features']:>8} "
+              f"{str(result['sublinear_tf']):>6} {result['classifier']:>6} {result['C']:>6g} "
+              f"{result['test_accuracy']:>8.4f} {result['train_seconds']:>7.2f} "
+              f"{result['artifact_bytes'] / 1024:>8.0f}K {result['latency_p50_ms']:>7.3f} "
+              f"{result['latency_p95_ms']:>7.3f}")
+
+    if args.results:
+        with open(args.results, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+        print(f"\nResults written to {args.results}")
+
+    if args.save_best:
+        eligible = [
+            i for i, result in enumerate(results)
+            if result["on_frontier"] and (
+                args.max_latency_ms is None or result["latency_p50_ms"] <= args.max_latency_ms
+            )
+        ]
+        if not eligible:
+            print("No frontier candidate fits the latency budget; nothing saved")
+            return
+        best = max(eligible, key=lambda i: results[i]["test_accuracy"])
+        vectorizer, clf = models[best]
+        os.makedirs(args.save_best, exist_ok=True)
+        joblib.dump(vectorizer, os.path.join(args.save_best, "tfidf_vectorizer.joblib"))
+        joblib.dump(clf, os.path.join(args.save_best, "fake_news_model.joblib"))
+        export_artifact(vectorizer, clf, os.path.join(args.save_best, ARTIFACT_NAME))
+        print(f"Saved candidate with test accuracy {results[best]['test_accuracy']:.4f} "
+              f"and p50 latency {results[best]['latency_p50_ms']:.3f} ms to {args.save_best}")
+
+
+if __name__ == "__main__":
+    main()
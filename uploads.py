@@ -0,0 +1,136 @@
+"""Bounded reading and type sniffing of uploaded PDFs and images.
+
+``UploadLimitMiddleware`` stops multipart requests before the form is
+parsed: a declared Content-Length over the limit is answered with 413
+without reading the body, and a body that turns out larger than declared
+(or is sent chunked) is cut off as soon as it passes the limit.
+
+``read_upload`` then reads the parsed upload in chunks, decides from the
+first bytes whether it is a PDF or an image (the client's Content-Type is
+not trusted) and returns the whole file as a single ``bytes`` object that
+is passed on to the extractors unchanged.
+"""
+import os
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+from metrics import set_input_type
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Room for multipart boundaries, part headers and the other form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# PDF readers accept a header anywhere in the first 1024 bytes
+PDF_HEADER_WINDOW = 1024
+
+SUPPORTED_TYPES_MESSAGE = "Unsupported file type. Please upload a PDF or image file (PNG, JPG, JPEG)."
+
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+)
+
+
+def _too_large_detail(size: Optional[int], max_bytes: int) -> str:
+    limit = f"{max_bytes / 1024 / 1024:.0f}MB"
+    if size is None:
+        return f"File size exceeds maximum limit of {limit}"
+    return f"File size ({size / 1024 / 1024:.1f}MB) exceeds maximum limit of {limit}"
+
+
+def sniff_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """(input type, MIME type) from a file's first bytes, or None if unsupported."""
+    if b"%PDF-" in head[:PDF_HEADER_WINDOW]:
+        return "pdf", "application/pdf"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image", "image/webp"
+    for magic, mime_type in _IMAGE_SIGNATURES:
+        if head.startswith(magic):
+            return "image", mime_type
+    return None
+
+
+async def read_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> Tuple[str, bytes]:
+    """Return (input type, content) of an upload, rejecting it as early as possible.
+
+    The type is sniffed from the first chunk and recorded on the request
+    trace before the rest of the file is read.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=_too_large_detail(file.size, max_bytes))
+
+    chunks = []
+    received = 0
+    kind = None
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_BYTES)
+        if chunk:
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(status_code=413, detail=_too_large_detail(None, max_bytes))
+            chunks.append(chunk)
+        if kind is None and (not chunk or received >= PDF_HEADER_WINDOW):
+            head = b"".join(c[:PDF_HEADER_WINDOW] for c in chunks)[:PDF_HEADER_WINDOW]
+            sniffed = sniff_type(head)
+            if sniffed is None:
+                raise HTTPException(status_code=400, detail=SUPPORTED_TYPES_MESSAGE)
+            kind = sniffed[0]
+            set_input_type(kind)
+        if not chunk:
+            break
+    # One copy; the chunks are released when this returns
+    return kind, b"".join(chunks)
+
+
+class UploadLimitMiddleware:
+    """Reject multipart request bodies larger than max_body_bytes before they are parsed."""
+
+    def __init__(self, app, max_body_bytes: int = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").lower().startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            declared = int(headers.get(b"content-length", b""))
+        except ValueError:
+            declared = None
+        if declared is not None and declared > self.max_body_bytes:
+            response = JSONResponse(
+                {"detail": _too_large_detail(declared, self.max_body_bytes - MULTIPART_OVERHEAD_BYTES)},
+                status_code=413,
+                headers={"Connection": "close"}
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Raised inside the form parser, so FastAPI answers with this error
+                    raise HTTPException(
+                        status_code=413,
+                        detail=_too_large_detail(None, self.max_body_bytes - MULTIPART_OVERHEAD_BYTES)
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,235 @@
+"""Rate limiting, prioritization, retries and coalescing for upstream APIs.
+
+Each provider (Gemini, OCR.space) gets an ``UpstreamScheduler``. A call
+waits for a permit, which needs both a free concurrency slot and a token
+from the provider's token bucket. Waiting calls are served interactive
+first, then bulk, then in arrival order. Rate-limit and transient failures
+are retried with jittered exponential backoff, and calls made with the same
+``key`` while one is already in flight share its result instead of paying
+for another upstream call.
+
+Queue depth, in-flight calls, permit wait times, retries and coalesced
+calls are exported through metrics.py.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from metrics import registry
+
+PRIORITIES = {"interactive": 0, "bulk": 1}
+# Responses worth retrying: rate limited, or the provider is briefly unavailable
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+# Share the result of identical in-flight calls; 0 sends every call upstream
+UPSTREAM_COALESCE = os.getenv("UPSTREAM_COALESCE", "1") != "0"
+
+_current_priority = contextvars.ContextVar("upstream_priority", default="interactive")
+
+WAIT_SECONDS = registry.histogram(
+    "fnd_upstream_wait_seconds", "Time calls waited for an upstream permit.", ("upstream", "priority")
+)
+RETRIES = registry.counter("fnd_upstream_retries_total", "Upstream calls retried.", ("upstream",))
+COALESCED = registry.counter(
+    "fnd_upstream_coalesced_total", "Calls answered by an identical in-flight call.", ("upstream",)
+)
+
+# name -> the latest scheduler for that upstream, read by the gauges below
+_schedulers = {}
+registry.callback("fnd_upstream_queue_depth", "Calls waiting for an upstream permit.",
+                  lambda: {(name,): s.queue_depth for name, s in _schedulers.items()},
+                  labelnames=("upstream",))
+registry.callback("fnd_upstream_in_flight", "Upstream calls in progress.",
+                  lambda: {(name,): s.in_flight for name, s in _schedulers.items()},
+                  labelnames=("upstream",))
+
+
+class RetryableStatus(Exception):
+    """Raised by a call whose HTTP response should be retried; carries the response."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (RetryableStatus, httpx.TransportError)):
+        return True
+    # google.api_core errors carry the HTTP status as ``code``
+    return getattr(error, "code", None) in RETRY_STATUS_CODES
+
+
+@contextmanager
+def request_priority(priority: Optional[str]):
+    """Run upstream calls made while handling this request at the given priority."""
+    priority = priority or "interactive"
+    if priority not in PRIORITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown priority '{priority}'. Use one of: {', '.join(PRIORITIES)}"
+        )
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class UpstreamScheduler:
+    """Token bucket + concurrency limit + priority queue for one provider.
+
+    ``rate_per_minute <= 0`` turns off the rate limit, leaving only the
+    concurrency limit.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_concurrency: int,
+                 max_queue: int = 100, max_retries: int = UPSTREAM_MAX_RETRIES,
+                 backoff_seconds: float = 0.5, max_backoff_seconds: float = 8.0):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.in_flight = 0
+        self.rejected = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flights = {}
+        _schedulers[name] = self
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _dispatch(self) -> None:
+        """Grant permits to waiting calls while slots and tokens allow."""
+        self._timer = None
+        self._refill()
+        while self._waiters and self.in_flight < self.max_concurrency:
+            if self._waiters[0][-1].done():
+                # Cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if self.rate > 0 and self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            *_, future = heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self.in_flight += 1
+            future.set_result(None)
+
+    async def _acquire(self, priority: str) -> None:
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail=f"Too many requests waiting for {self.name}. Please try again shortly.",
+                headers={"Retry-After": "5"}
+            )
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._sequence), future))
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The permit was granted just as the caller went away
+                self._release()
+            raise
+        WAIT_SECONDS.observe(time.perf_counter() - start, upstream=self.name, priority=priority)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        if self._timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None):
+        """Hold a permit for the duration of the block (e.g. a streamed response)."""
+        await self._acquire(priority or _current_priority.get())
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _call_with_retries(self, fn: Callable[[], Awaitable], priority: str):
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority)
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                RETRIES.inc(upstream=self.name)
+                print(f"{self.name} call failed ({e}); retry {attempt + 1} of {self.max_retries}")
+            finally:
+                self._release()
+            # Full jitter spreads out the retries of calls that failed together
+            cap = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, cap))
+
+    async def call(self, fn: Callable[[], Awaitable], key: Optional[str] = None,
+                   priority: Optional[str] = None):
+        """Await fn() under this provider's limits.
+
+        Concurrent calls with the same ``key`` share one execution. The shared
+        call keeps running if one of the callers is cancelled.
+        """
+        priority = priority or _current_priority.get()
+        if key is None or not UPSTREAM_COALESCE:
+            return await self._call_with_retries(fn, priority)
+
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_with_retries(fn, priority))
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            COALESCED.inc(upstream=self.name)
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "coalescing": len(self._flights)
+        }
+
+
+def scheduler_from_env(name: str, prefix: str, rate_per_minute: int, max_concurrency: int):
+    """Build a scheduler configured by <PREFIX>_RATE_PER_MINUTE, _BURST, _MAX_CONCURRENCY, _MAX_QUEUE."""
+    max_concurrency = int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(max_concurrency)))
+    return UpstreamScheduler(
+        name,
+        rate_per_minute=float(os.getenv(f"{prefix}_RATE_PER_MINUTE", str(rate_per_minute))),
+        burst=int(os.getenv(f"{prefix}_BURST", str(max_concurrency))),
+        max_concurrency=max_concurrency,
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", "100"))
+    )
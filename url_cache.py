@@ -0,0 +1,136 @@
+"""Cache of extracted article text for submitted URLs.
+
+Entries are keyed by a canonical form of the URL (tracking parameters and
+fragments removed) and remember the ETag/Last-Modified validators, so stale
+pages are revalidated with a conditional GET instead of being re-downloaded
+and re-parsed.
+"""
+import asyncio
+import math
+import time
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from ttl_cache import TTLCache
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref_src", "ref_url", "cmpid", "ncid", "ocid", "_ga", "smid", "sr_share"
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so links that differ only in tracking noise share a key."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+async def read_capped(response: httpx.Response, max_bytes: Optional[int] = None) -> bytes:
+    """Read a streamed response body, stopping once max_bytes have arrived."""
+    chunks = []
+    received = 0
+    async for chunk in response.aiter_bytes():
+        if max_bytes is not None and received + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - received])
+            break
+        chunks.append(chunk)
+        received += len(chunk)
+    return b"".join(chunks)
+
+
+class CachedPage:
+    __slots__ = ("text", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, text: str, etag: Optional[str], last_modified: Optional[str]):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time()
+
+
+class PageCache:
+    """LRU cache of extracted page text with conditional-GET revalidation.
+
+    Entries are stored in a TTLCache without expiry: a page older than
+    ``fresh_seconds`` is kept for its validators and revalidated on use.
+    """
+
+    def __init__(self, max_entries: int = 1000, fresh_seconds: float = 300):
+        self.max_entries = max_entries
+        self.fresh_seconds = fresh_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._store = TTLCache(max_entries, ttl_seconds=math.inf)
+
+    async def fetch_text(self, client: httpx.AsyncClient, url: str,
+                         extract: Callable[[str], str], timeout: float = 10,
+                         max_bytes: Optional[int] = None) -> str:
+        """Return the extracted text for url, fetching or revalidating as needed.
+
+        ``extract`` turns the page HTML into article text and is run in a
+        worker thread; at most ``max_bytes`` of the body are downloaded.
+        HTTP errors from the fetch are raised to the caller.
+        """
+        key = canonicalize_url(url)
+        entry = self._store.get(key)
+        if entry is not None and time.time() - entry.fetched_at < self.fresh_seconds:
+            self.hits += 1
+            return entry.text
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async with client.stream("GET", url, headers=headers, timeout=timeout) as response:
+            if entry is not None and response.status_code == 304:
+                # Stored values are not mutated; the refreshed entry replaces it
+                self._store.set(key, CachedPage(
+                    entry.text,
+                    response.headers.get("ETag", entry.etag),
+                    response.headers.get("Last-Modified", entry.last_modified)
+                ))
+                self.revalidated += 1
+                return entry.text
+
+            response.raise_for_status()
+            body = await read_capped(response, max_bytes)
+            page_html = body.decode(response.encoding or "utf-8", errors="replace")
+
+        self.misses += 1
+        text = await asyncio.to_thread(extract, page_html)
+        if text:
+            self._store.set(key, CachedPage(
+                text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            ))
+        return text
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._store),
+            "max_entries": self.max_entries,
+            "fresh_seconds": self.fresh_seconds,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self._store.evictions
+        }
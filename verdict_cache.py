@@ -0,0 +1,179 @@
+"""Cache of Gemini verification reports keyed by normalized article content.
+
+Async code should use ``aget``/``aset``: backends that do blocking I/O
+(SQLite) run there in a thread so the event loop is not held up.
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from ttl_cache import TTLCache
+
+
+def normalize_content(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different copies match."""
+    return " ".join(text.casefold().split())
+
+
+def content_key(text: str) -> str:
+    """Return the cache key for an article's text."""
+    return hashlib.sha256(normalize_content(text).encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """Base class tracking hit/miss counters for the cache backends."""
+
+    backend = "none"
+    # Whether get/set do blocking I/O and must be kept off the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        verdict = self._get(key)
+        with self._lock:
+            if verdict is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return verdict
+
+    def set(self, key: str, verdict: str) -> None:
+        self._set(key, verdict)
+
+    async def aget(self, key: str) -> Optional[str]:
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, verdict: str) -> None:
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, verdict)
+        else:
+            self.set(key, verdict)
+
+    async def astats(self) -> dict:
+        if self.blocking:
+            return await asyncio.to_thread(self.stats)
+        return self.stats()
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _set(self, key: str, verdict: str) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class MemoryVerdictCache(VerdictCache):
+    """In-process LRU cache with per-entry expiry."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 6 * 3600):
+        super().__init__(max_entries, ttl_seconds)
+        self._store = TTLCache(max_entries, ttl_seconds)
+
+    def _get(self, key: str) -> Optional[str]:
+        return self._store.get(key)
+
+    def _set(self, key: str, verdict: str) -> None:
+        self._store.set(key, verdict)
+        self.evictions = self._store.evictions
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class SQLiteVerdictCache(VerdictCache):
+    """On-disk cache that survives restarts and can be shared by workers."""
+
+    backend = "sqlite"
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: float = 6 * 3600):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "key TEXT PRIMARY KEY, verdict TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts (accessed_at)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT verdict, expires_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key: str, verdict: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, verdict, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, verdict, now + self.ttl_seconds, now)
+            )
+            excess = self._count() - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM verdicts WHERE key IN "
+                    "(SELECT key FROM verdicts ORDER BY accessed_at LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+def create_verdict_cache(backend: str = "memory", path: str = "verdict_cache.sqlite3",
+                         max_entries: int = 10000, ttl_seconds: float = 6 * 3600) -> VerdictCache:
+    """Build the cache backend named by ``backend`` (memory, sqlite or none)."""
+    backend = backend.lower()
+    if backend == "memory":
+        return MemoryVerdictCache(max_entries, ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteVerdictCache(path, max_entries, ttl_seconds)
+    if backend == "none":
+        return VerdictCache(max_entries, ttl_seconds)
+    raise ValueError(f"Unknown verdict cache backend: {backend}")